@@ -21,6 +21,8 @@ import json
 import asks
 import logging
 
+import trio
+
 from ..log import colorize_json
 
 
@@ -36,6 +38,18 @@ class NoData(BrokerError):
     "Symbol data not permitted"
 
 
+def _check_status(resp: asks.response_objects.Response) -> None:
+    if not resp.status_code == 200:
+        raise BrokerError(resp.body)
+
+
+def _log_json(log: logging.Logger, data: dict) -> None:
+    # NOTE: colorizing large payloads is expensive so only do it
+    # when the output will actually be emitted.
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(f"Received json contents:\n{colorize_json(data)}")
+
+
 def resproc(
     resp: asks.response_objects.Response,
     log: logging.Logger,
@@ -45,14 +59,43 @@ def resproc(
 
     Raise the appropriate error on non-200 OK responses.
     """
-    if not resp.status_code == 200:
-        raise BrokerError(resp.body)
+    _check_status(resp)
+    try:
+        data = resp.json()
+    except json.decoder.JSONDecodeError:
+        log.exception(f"Failed to process {resp}:\n{resp.text}")
+        raise BrokerError(resp.text)
+    else:
+        _log_json(log, data)
+
+    return data if return_json else resp
+
+
+# limits the number of concurrent worker thread json decodes
+_parse_limiter = trio.CapacityLimiter(2)
+
+
+async def aresproc(
+    resp: asks.response_objects.Response,
+    log: logging.Logger,
+) -> dict:
+    """Like ``resproc()`` but decode the response's json content in
+    a worker thread.
+
+    Use this for (potentially) large responses such that decoding
+    doesn't block the event loop and stall other concurrent requests.
+    """
+    _check_status(resp)
     try:
-        json = resp.json()
+        data = await trio.to_thread.run_sync(
+            json.loads,
+            resp.body,
+            limiter=_parse_limiter,
+        )
     except json.decoder.JSONDecodeError:
         log.exception(f"Failed to process {resp}:\n{resp.text}")
         raise BrokerError(resp.text)
     else:
-        log.debug(f"Received json contents:\n{colorize_json(json)}")
+        _log_json(log, data)
 
-    return json if return_json else resp
+    return data
@@ -41,7 +41,9 @@ async def open_cached_client(
 ) -> 'Client':  # noqa
     """Get a cached broker client from the current actor's local vars.
 
-    If one has not been setup do it and cache it.
+    If one has not been setup do it and cache it. Concurrent consumers
+    share the same client instance which is only torn down once the
+    last consumer exits.
     """
     global _cache
 
@@ -53,27 +55,26 @@ async def open_cached_client(
     client = None
 
     try:
-        log.info(f"Loading existing `{brokername}` client")
-
         async with lock:
-            client = clients[brokername]
-            client._consumers += 1
+            client = clients.get(brokername)
 
-        yield client
+            if client is None:
+                log.info(f"Creating new client for broker {brokername}")
 
-    except KeyError:
-        log.info(f"Creating new client for broker {brokername}")
+                brokermod = get_brokermod(brokername)
+                exit_stack = AsyncExitStack()
 
-        async with lock:
-            brokermod = get_brokermod(brokername)
-            exit_stack = AsyncExitStack()
+                client = await exit_stack.enter_async_context(
+                    brokermod.get_client()
+                )
+                client._consumers = 0
+                client._exit_stack = exit_stack
+                clients[brokername] = client
 
-            client = await exit_stack.enter_async_context(
-                brokermod.get_client()
-            )
-            client._consumers = 0
-            client._exit_stack = exit_stack
-            clients[brokername] = client
+            else:
+                log.info(f"Loading existing `{brokername}` client")
+
+            client._consumers += 1
 
         yield client
 
@@ -82,4 +83,9 @@ async def open_cached_client(
             # if no more consumers, teardown the client
             client._consumers -= 1
             if client._consumers <= 0:
+                # drop from the cache first so that no new consumer can
+                # acquire a client which is being torn down.
+                if clients.get(brokername) is client:
+                    clients.pop(brokername)
+
                 await client._exit_stack.aclose()
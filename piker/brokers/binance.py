@@ -248,28 +248,31 @@ class Client:
         # TODO: pack this bars scheme into a ``pydantic`` validator type:
         # https://binance-docs.github.io/apidocs/spot/en/#kline-candlestick-data
 
-        # TODO: we should port this to ``pydantic`` to avoid doing
-        # manual validation ourselves..
-        new_bars = []
-        for i, bar in enumerate(bars):
-
-            bar = OHLC(*bar)
-
-            row = []
-            for j, (name, ftype) in enumerate(_ohlc_dtype[1:]):
-
-                # TODO: maybe we should go nanoseconds on all
-                # history time stamps?
-                if name == 'time':
-                    # convert to epoch seconds: float
-                    row.append(bar.time / 1000.0)
-
-                else:
-                    row.append(getattr(bar, name))
-
-            new_bars.append((i,) + tuple(row))
-
-        array = np.array(new_bars, dtype=_ohlc_dtype) if as_np else bars
+        if not as_np:
+            return bars
+
+        # convert all fields to native types column-wise instead of
+        # validating + repacking each row; the raw rows are all
+        # ``str``/``int`` values in ``OHLC`` field order.
+        raw = np.array(bars)
+        n = len(raw)
+
+        # NOTE: ``bar_wap`` is left zeroed
+        array = np.zeros(n, dtype=_ohlc_dtype)
+        if not n:
+            return array
+
+        array['index'] = np.arange(n)
+
+        # TODO: maybe we should go nanoseconds on all
+        # history time stamps?
+        # convert to epoch seconds
+        array['time'] = raw[:, 0].astype(int) / 1000.0
+        array['open'] = raw[:, 1].astype(float)
+        array['high'] = raw[:, 2].astype(float)
+        array['low'] = raw[:, 3].astype(float)
+        array['close'] = raw[:, 4].astype(float)
+        array['volume'] = raw[:, 5].astype(float)
         return array
 
 
@@ -252,13 +252,13 @@ def symbol_info(config, tickers):
     # global opts
     brokermod = config['brokermods'][0]
 
-    quotes = trio.run(partial(core.symbol_info, brokermod, tickers))
+    quotes = trio.run(partial(core.symbol_infos, brokermod, tickers))
     if not quotes:
         log.error(f"No quotes could be found for {tickers}?")
         return
 
     if len(quotes) < len(tickers):
-        syms = tuple(map(itemgetter('symbol'), quotes))
+        syms = tuple(quotes)
         for ticker in tickers:
             if ticker not in syms:
                 brokermod.log.warn(f"Could not find symbol {ticker}?")
@@ -278,8 +278,11 @@ def search(config, pattern):
     # define tractor entrypoint
     async def main(func):
 
-        async with maybe_open_pikerd(
-            loglevel=config['loglevel'],
+        async with (
+            maybe_open_pikerd(
+                loglevel=config['loglevel'],
+            ),
+            core.open_brokerd_portals(),
         ):
             return await func()
 
@@ -19,57 +19,257 @@ Broker high level cross-process API layer.
 
 This API should be kept "remote service compatible" meaning inputs to
 routines should be primitive data types where possible.
+
+All routines acquire their broker client through ``open_cached_client()``
+such that a single client (and its underlying connection pool/session)
+is shared by all consumers in the current actor. Callers should keep
+a client open around batches of these calls (eg. by entering
+``open_cached_client()`` themselves) instead of paying for a fresh
+connect on every call.
 """
 import inspect
+import sys
+import time
+from collections import defaultdict, OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from types import ModuleType
-from typing import List, Dict, Any, Optional
+from typing import (
+    List, Dict, Any, Optional, Callable, Tuple, NamedTuple, AsyncIterator,
+    Sequence, TypedDict, Union,
+)
 
 import trio
+from trio_typing import TaskStatus
+import tractor
 
 from ..log import get_logger
-from . import get_brokermod
-from .._daemon import maybe_spawn_brokerd
 from .api import open_cached_client
 
 
 log = get_logger(__name__)
 
 
-async def api(brokername: str, methname: str, **kwargs) -> dict:
-    """Make (proxy through) a broker API call by name and return its result.
+class Quote(TypedDict, total=False):
+    """A broker quote.
+
+    Only the fields piker itself relies on are declared; backends
+    deliver their (open ended) native quote fields alongside.
     """
-    brokermod = get_brokermod(brokername)
-    async with brokermod.get_client() as client:
+    key: str  # subscription key, normally the symbol
+    symbol: str
+
+
+def _params(meth: Callable) -> Tuple[str, ...]:
+    """Return the parameter names (excluding ``self``) of ``meth``.
+
+    Names are read straight from the method's code object; methods
+    without a code object (eg. proxies, builtins) fall back to
+    ``inspect.signature()``.
+    """
+    func = inspect.unwrap(getattr(meth, '__func__', meth))
+    code = getattr(func, '__code__', None)
+
+    if code is None:
+        return tuple(inspect.signature(meth).parameters)
+
+    # include any ``*args`` and ``**kwargs`` names
+    n = code.co_argcount + code.co_kwonlyargcount
+    n += bool(code.co_flags & inspect.CO_VARARGS)
+    n += bool(code.co_flags & inspect.CO_VARKEYWORDS)
+
+    # skip ``self`` on bound methods
+    start = 1 if getattr(meth, '__self__', None) is not None else 0
+    return code.co_varnames[start:n]
+
+
+def _lookup_meth(
+    client: Any,
+    methname: str,
+) -> Optional[Tuple[Callable, Tuple[str, ...]]]:
+    """Lookup ``methname`` on either the client or its ``.api`` namespace
+    returning the bound method and its parameter names.
+
+    Results are stored in a per client ``._method_table`` so that
+    repeat calls (the client is long lived and shared via
+    ``open_cached_client()``) are a single dict lookup.
+    """
+    table = getattr(client, '_method_table', None)
+    if table is None:
+        table = client._method_table = {}
+
+    entry = table.get(methname)
+    if entry is None:
         meth = getattr(client, methname, None)
         if meth is None:
             log.debug(
                 f"Couldn't find API method {methname} looking up on client")
-            meth = getattr(client.api, methname, None)
+            meth = getattr(getattr(client, 'api', None), methname, None)
 
         if meth is None:
+            return None
+
+        entry = table[methname] = (meth, _params(meth))
+
+    return entry
+
+
+async def api(brokername: str, methname: str, **kwargs) -> dict:
+    """Make (proxy through) a broker API call by name and return its result.
+    """
+    async with open_cached_client(brokername) as client:
+        entry = _lookup_meth(client, methname)
+
+        if entry is None:
             log.error(f"No api method `{methname}` could be found?")
             return
 
-        if not kwargs:
+        meth, params = entry
+        if not kwargs and params:
             # verify kwargs requirements are met
-            sig = inspect.signature(meth)
-            if sig.parameters:
-                log.error(
-                    f"Argument(s) are required by the `{methname}` method: "
-                    f"{tuple(sig.parameters.keys())}")
-                return
+            log.error(
+                f"Argument(s) are required by the `{methname}` method: "
+                f"{params}")
+            return
 
         return await meth(**kwargs)
 
 
+@dataclass
+class _Batch:
+    """A (possibly shared) in-flight broker request.
+    """
+    keys: set = field(default_factory=set)
+    done: trio.Event = field(default_factory=trio.Event)
+    result: Optional[Any] = None
+
+
+class _QuoteCoalescer:
+    """Merge concurrent quote requests for the same broker into a single
+    multi-symbol ``Client.quote()`` call.
+
+    The first caller to arrive becomes the "leader" for a short window
+    during which other callers may add their tickers to the batch; the
+    leader then issues one request on behalf of all and each caller is
+    handed back only the quotes it asked for.
+    """
+    _by_broker: Dict[str, '_QuoteCoalescer'] = {}
+
+    # time to wait for other callers to join a batch
+    window: float = 0.0005
+
+    def __init__(self, brokername: str) -> None:
+        self.brokername = brokername
+        self._batch: Optional[_Batch] = None
+
+    @classmethod
+    def get(cls, brokermod: ModuleType) -> '_QuoteCoalescer':
+        name = brokermod.name
+        inst = cls._by_broker.get(name)
+        if inst is None:
+            inst = cls._by_broker[name] = cls(name)
+        return inst
+
+    async def _quote(self, tickers: List[str]) -> List[Quote]:
+        async with open_cached_client(self.brokername) as client:
+            return await client.quote(tickers)
+
+    async def request(self, tickers: List[str]) -> List[Quote]:
+        batch = self._batch
+
+        if batch is None:
+            # we lead this batch
+            batch = self._batch = _Batch()
+            batch.keys.update(tickers)
+            try:
+                await trio.sleep(self.window)
+                # close the batch to new joiners
+                self._batch = None
+                batch.result = await self._quote(list(batch.keys))
+            finally:
+                if self._batch is batch:
+                    self._batch = None
+                batch.done.set()
+
+        else:
+            batch.keys.update(tickers)
+            await batch.done.wait()
+
+            if batch.result is None:
+                # the leader errored or was cancelled so just make
+                # our own request.
+                return await self._quote(tickers)
+
+        quotes = batch.result
+        if len(batch.keys) == len(set(tickers)):
+            # we were the only requester
+            return quotes
+
+        wanted = {t.lower() for t in tickers}
+        return [
+            quote for quote in quotes
+            if quote and _quote_key(quote) in wanted
+        ]
+
+
+def _quote_key(quote: Quote) -> str:
+    return str(quote.get('key', quote.get('symbol'))).lower()
+
+
+# (broker, ticker) -> (monotonic time of receipt, quote)
+_last_quotes: Dict[Tuple[str, str], Tuple[float, Quote]] = {}
+
+# max age of a quote served from ``_last_quotes``
+_quote_ttl: float = 0.25
+
+
 async def stocks_quote(
     brokermod: ModuleType,
-    tickers: List[str]
-) -> Dict[str, Dict[str, Any]]:
-    """Return quotes dict for ``tickers``.
+    tickers: Sequence[str]
+) -> List[Quote]:
+    """Return quotes for ``tickers``.
+
+    Concurrent calls for the same broker are coalesced into a single
+    broker request and quotes younger then ``_quote_ttl`` seconds are
+    served from cache; as such returned quotes may be shared with
+    other callers and should not be mutated.
     """
-    async with brokermod.get_client() as client:
-        return await client.quote(tickers)
+    name = brokermod.name
+    tickers = tuple(map(sys.intern, tickers))
+    now = time.monotonic()
+
+    hits = {}
+    misses = []
+    for ticker in tickers:
+        entry = _last_quotes.get((name, ticker))
+        if entry is not None and now - entry[0] < _quote_ttl:
+            hits[ticker] = entry[1]
+        else:
+            misses.append(ticker)
+
+    if not misses:
+        return [hits[ticker] for ticker in tickers]
+
+    any_cached = bool(hits)
+    quotes = await _QuoteCoalescer.get(brokermod).request(misses)
+
+    now = time.monotonic()
+    by_key = {_quote_key(quote): quote for quote in quotes if quote}
+    for ticker in misses:
+        quote = by_key.get(ticker.lower())
+        if quote is not None:
+            _last_quotes[(name, ticker)] = (now, quote)
+            hits[ticker] = quote
+
+    if not any_cached:
+        # nothing came from cache, return the broker's response as is
+        return quotes
+
+    return [hits[ticker] for ticker in tickers if ticker in hits]
+
+
+# max number of concurrent per-expiry chain requests
+_option_chain_concurrency: int = 8
 
 
 # TODO: these need tests
@@ -77,13 +277,13 @@ async def option_chain(
     brokermod: ModuleType,
     symbol: str,
     date: Optional[str] = None,
-) -> Dict[str, Dict[str, Dict[str, Any]]]:
+) -> Union[List[Quote], Dict[str, Quote]]:
     """Return option chain for ``symbol`` for ``date``.
 
     By default all expiries are returned. If ``date`` is provided
     then contract quotes for that single expiry are returned.
     """
-    async with brokermod.get_client() as client:
+    async with open_cached_client(brokermod.name) as client:
         if date:
             id = int((await client.tickers2ids([symbol]))[symbol])
             # build contracts dict for single expiry
@@ -93,8 +293,34 @@ async def option_chain(
             # get all contract expiries
             # (takes a long-ass time on QT fwiw)
             contracts = await client.get_all_contracts([symbol])
-            # return chains for all dates
-            return await client.option_chains(contracts)
+
+            # request chains for all dates concurrently, one expiry
+            # per request and store results by position so that the
+            # merged output is ordered by expiry.
+            shards = [{key: val} for key, val in contracts.items()]
+            results: List[Any] = [None] * len(shards)
+            limiter = trio.CapacityLimiter(_option_chain_concurrency)
+
+            async def get_chain(i: int) -> None:
+                async with limiter:
+                    results[i] = await client.option_chains(shards[i])
+
+            async with trio.open_nursery() as n:
+                for i in range(len(shards)):
+                    n.start_soon(get_chain, i)
+
+            if results and isinstance(results[0], dict):
+                return {k: v for chain in results for k, v in chain.items()}
+
+            return [quote for chain in results for quote in chain]
+
+
+# (broker, symbol) -> (monotonic time of lookup, contracts)
+_contracts_cache: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+_contracts_locks: Dict[Tuple[str, str], trio.Lock] = defaultdict(trio.Lock)
+
+# contracts change at most daily so there's no need to re-request often
+_contracts_ttl: float = 3600
 
 
 async def contracts(
@@ -102,10 +328,29 @@ async def contracts(
     symbol: str,
 ) -> Dict[str, Dict[str, Dict[str, Any]]]:
     """Return option contracts (all expiries) for ``symbol``.
+
+    Results are cached for ``_contracts_ttl`` seconds and concurrent
+    lookups of the same symbol are serialized such that only one
+    broker request is made.
     """
-    async with brokermod.get_client() as client:
-        # return await client.get_all_contracts([symbol])
-        return await client.get_all_contracts([symbol])
+    key = (brokermod.name, symbol)
+
+    async with _contracts_locks[key]:
+        entry = _contracts_cache.get(key)
+        if entry is not None:
+            ts, contracts = entry
+            if time.monotonic() - ts < _contracts_ttl:
+                return contracts
+
+        async with open_cached_client(brokermod.name) as client:
+            contracts = await client.get_all_contracts([symbol])
+
+        _contracts_cache[key] = (time.monotonic(), contracts)
+        return contracts
+
+
+# (broker, symbol, request kwargs) -> in-flight ``bars()`` request
+_bars_inflight: Dict[Tuple[str, str, tuple], _Batch] = {}
 
 
 async def bars(
@@ -114,9 +359,76 @@ async def bars(
     **kwargs,
 ) -> Dict[str, Dict[str, Dict[str, Any]]]:
     """Return option contracts (all expiries) for ``symbol``.
+
+    Identical concurrent requests are deduplicated into a single broker
+    call and (all callers) share the same result.
     """
-    async with brokermod.get_client() as client:
-        return await client.bars(symbol, **kwargs)
+    key = (brokermod.name, symbol, tuple(sorted(kwargs.items())))
+    try:
+        batch = _bars_inflight.get(key)
+    except TypeError:
+        # unhashable request args, don't bother deduping
+        key = batch = None
+
+    if batch is not None:
+        await batch.done.wait()
+        if batch.result is not None:
+            return batch.result
+
+        # the original request failed, make our own
+        batch = None
+
+    elif key is not None:
+        batch = _bars_inflight[key] = _Batch()
+
+    try:
+        async with open_cached_client(brokermod.name) as client:
+            result = await client.bars(symbol, **kwargs)
+
+        if batch is not None:
+            batch.result = result
+
+        return result
+
+    finally:
+        if batch is not None and _bars_inflight.get(key) is batch:
+            _bars_inflight.pop(key)
+            batch.done.set()
+
+
+# max number of concurrent single symbol info requests
+_symbol_info_concurrency: int = 8
+
+
+async def symbol_infos(
+    brokermod: ModuleType,
+    symbols: List[str],
+    **kwargs,
+) -> Dict[str, Dict[str, Any]]:
+    """Return symbol info for each of ``symbols`` from broker.
+
+    If the broker client advertises batch lookups (by setting
+    ``Client.symbol_info_batched``) a single request is made, otherwise
+    one (concurrent) request is made per symbol.
+    """
+    async with open_cached_client(brokermod.name) as client:
+
+        if getattr(client, 'symbol_info_batched', False):
+            return await client.symbol_info(list(symbols), **kwargs)
+
+        infos = {}
+        limiter = trio.CapacityLimiter(_symbol_info_concurrency)
+
+        async def get_info(symbol: str) -> None:
+            async with limiter:
+                infos[symbol] = await client.symbol_info(symbol, **kwargs)
+
+        async with trio.open_nursery() as n:
+            for symbol in symbols:
+                n.start_soon(get_info, symbol)
+
+        # keep input order
+        return {symbol: infos[symbol] for symbol in symbols}
 
 
 async def symbol_info(
@@ -126,45 +438,250 @@ async def symbol_info(
 ) -> Dict[str, Dict[str, Dict[str, Any]]]:
     """Return symbol info from broker.
     """
-    async with brokermod.get_client() as client:
-        return await client.symbol_info(symbol, **kwargs)
+    return (await symbol_infos(brokermod, [symbol], **kwargs)).get(symbol)
 
 
-async def search_w_brokerd(name: str, pattern: str) -> dict:
+@tractor.context
+async def stream_search_w_brokerd(
+    ctx: tractor.Context,
+    name: str,
+    pattern: str,
+) -> None:
+    """Stream symbol search matches back to the caller in chunks as
+    they are produced by the backend.
 
+    If the backend's ``Client.search_symbols()`` is an async generator
+    each (dict) chunk of matches it yields is sent as soon as it
+    arrives, otherwise all matches are sent as a single chunk.
+    """
     async with open_cached_client(name) as client:
 
-        # TODO: support multiple asset type concurrent searches.
-        return await client.search_symbols(pattern=pattern)
+        await ctx.started()
 
+        async with ctx.open_stream() as stream:
 
-async def symbol_search(
-    brokermods: list[ModuleType],
-    pattern: str,
-    **kwargs,
-) -> Dict[str, Dict[str, Dict[str, Any]]]:
-    """Return symbol info from broker.
+            search = client.search_symbols
+            if inspect.isasyncgenfunction(search):
+                async for matches in search(pattern=pattern):
+                    await stream.send(matches)
+            else:
+                await stream.send(await search(pattern=pattern))
+
+
+class SearchResult(NamedTuple):
+    """Symbol search matches for a single broker backend.
+
+    Being a (named) tuple this is packed as a fixed length array on the
+    wire instead of a key-tagged map.
     """
-    results = []
+    broker: str
+    matches: Dict[str, Any]
+
+
+# brokername -> (portal to its ``brokerd``, scope of the task holding it)
+_portals: Dict[str, Tuple[tractor.Portal, trio.CancelScope]] = {}
+_portal_locks: Dict[str, trio.Lock] = defaultdict(trio.Lock)
 
-    async def search_backend(brokername: str) -> None:
+# nursery of the active ``open_brokerd_portals()`` block
+_portals_nursery: Optional[trio.Nursery] = None
+
+
+async def _hold_brokerd_portal(
+    brokername: str,
+    task_status: TaskStatus[
+        Tuple[tractor.Portal, trio.CancelScope]
+    ] = trio.TASK_STATUS_IGNORED,
+) -> None:
+    """Hold a portal to the ``brokerd`` for ``brokername`` open until
+    cancelled.
+
+    Running as its own task means the portal's ``maybe_spawn_brokerd()``
+    block (and the nurseries it opens) is entered and exited by the same
+    task regardless of which searches end up using it.
+    """
+    # NOTE: imported here to avoid pulling in the daemon/actor machinery
+    # for the (common) non-search use of this module
+    from .._daemon import maybe_spawn_brokerd
+
+    with trio.CancelScope() as cs:
+        async with maybe_spawn_brokerd(brokername) as portal:
+            entry = _portals[brokername] = (portal, cs)
+            task_status.started(entry)
+            try:
+                await trio.sleep_forever()
+            finally:
+                if _portals.get(brokername) is entry:
+                    _portals.pop(brokername)
+
+
+@asynccontextmanager
+async def open_brokerd_portals() -> AsyncIterator[None]:
+    """Keep the portals to each ``brokerd`` used by ``symbol_search()``
+    open, for reuse by every search, until this block exits.
+
+    Each portal is held by a task in this block's nursery. Nested blocks
+    reuse the outermost one.
+    """
+    global _portals_nursery
 
-        async with maybe_spawn_brokerd(
-            brokername,
-        ) as portal:
+    if _portals_nursery is not None:
+        yield
+        return
 
-            results.append((
+    async with trio.open_nursery() as n:
+        _portals_nursery = n
+        try:
+            yield
+        finally:
+            _portals_nursery = None
+            n.cancel_scope.cancel()
+
+
+@asynccontextmanager
+async def _open_brokerd_portal(
+    brokername: str,
+) -> AsyncIterator[tractor.Portal]:
+    """Deliver a portal to the ``brokerd`` for ``brokername``, spawning
+    the daemon if needed.
+
+    Inside ``open_brokerd_portals()`` the portal is cached and only
+    re-acquired once its channel has disconnected, otherwise it only
+    lives for this block.
+    """
+    if _portals_nursery is None:
+        from .._daemon import maybe_spawn_brokerd
+
+        async with maybe_spawn_brokerd(brokername) as portal:
+            yield portal
+        return
+
+    async with _portal_locks[brokername]:
+        entry = _portals.get(brokername)
+        if entry is None or not entry[0].channel.connected():
+            if entry is not None:
+                # release the stale portal's holder task
+                entry[1].cancel()
+
+            entry = await _portals_nursery.start(
+                _hold_brokerd_portal,
                 brokername,
-                await portal.run(
-                    search_w_brokerd,
+            )
+
+    yield entry[0]
+
+
+@asynccontextmanager
+async def stream_symbol_search(
+    brokermods: list[ModuleType],
+    pattern: str,
+) -> AsyncIterator[trio.MemoryReceiveChannel]:
+    """Search all ``brokermods`` concurrently and deliver each chunk of
+    matches, as a ``SearchResult``, over the yielded channel as soon as
+    it arrives from its ``brokerd``; a broker may deliver many results.
+
+    This avoids slow backends delaying the results of faster ones. Any
+    still running searches are cancelled on exit of the block.
+
+    Portals to each ``brokerd`` are reused across searches made inside
+    an ``open_brokerd_portals()`` block.
+    """
+    send, recv = trio.open_memory_channel(len(brokermods))
+
+    async def search_backend(
+        brokername: str,
+        send: trio.MemorySendChannel,
+    ) -> None:
+
+        async with (
+            send,
+            _open_brokerd_portal(brokername) as portal,
+        ):
+            # NOTE: ``tractor`` only sends the target's module path and
+            # function name (not a pickled function) and this module is
+            # already enabled (registered) for rpc in every ``brokerd``
+            # via ``piker._daemon._data_mods`` so there's no extra
+            # per-call function resolution to amortize here.
+            async with (
+                portal.open_context(
+                    stream_search_w_brokerd,
                     name=brokername,
                     pattern=pattern,
-                ),
-            ))
+                ) as (ctx, _),
+                ctx.open_stream() as stream,
+            ):
+                async for chunk in stream:
+                    # some backends (eg. questrade) return ``None``
+                    # when there are no matches
+                    if chunk:
+                        await send.send(SearchResult(brokername, chunk))
 
-    async with trio.open_nursery() as n:
+    async with trio.open_nursery() as n, recv:
+
+        async with send:
+            for mod in brokermods:
+                n.start_soon(search_backend, mod.name, send.clone())
+
+        yield recv
+        n.cancel_scope.cancel()
+
+
+# patterns shorter then this aren't searched
+_min_search_pattern_len: int = 2
 
-        for mod in brokermods:
-            n.start_soon(search_backend, mod.name)
+# (broker names, pattern) -> (monotonic time of search, results tuple)
+_search_cache: OrderedDict = OrderedDict()
+_search_cache_size: int = 256
+_search_cache_ttl: float = 5.0
 
-    return results
+
+def clear_search_cache() -> None:
+    """Drop all cached ``symbol_search()`` results, eg. after a backend's
+    symbol set has changed.
+    """
+    _search_cache.clear()
+
+
+async def symbol_search(
+    brokermods: list[ModuleType],
+    pattern: str,
+) -> List[SearchResult]:
+    """Return symbol search matches from each broker.
+
+    Results are ordered the same as the input ``brokermods``. Repeat
+    searches within ``_search_cache_ttl`` seconds are served from
+    cache and patterns shorter than ``_min_search_pattern_len`` return
+    no results without searching. Each call returns a new list but
+    cached results (and their matches) are shared and should not be
+    mutated.
+    """
+    if len(pattern) < _min_search_pattern_len:
+        return []
+
+    key = (tuple(mod.name for mod in brokermods), pattern)
+    entry = _search_cache.get(key)
+    if entry is not None:
+        ts, results = entry
+        if time.monotonic() - ts < _search_cache_ttl:
+            _search_cache.move_to_end(key)
+            return list(results)
+
+    matches: Dict[str, Dict[str, Any]] = {mod.name: {} for mod in brokermods}
+
+    async with stream_symbol_search(
+        brokermods,
+        pattern,
+    ) as stream:
+        async for result in stream:
+            matches[result.broker].update(result.matches)
+
+    results = tuple(
+        SearchResult(name, broker_matches)
+        for name, broker_matches in matches.items()
+    )
+
+    _search_cache[key] = (time.monotonic(), results)
+    _search_cache.move_to_end(key)
+    if len(_search_cache) > _search_cache_size:
+        _search_cache.popitem(last=False)
+
+    return list(results)
@@ -22,15 +22,19 @@ built on it) and thus actor aware API calls must be spawned with
 ``infected_aio==True``.
 """
 from contextlib import asynccontextmanager
-from dataclasses import asdict
-from datetime import datetime
+from copy import copy
+from dataclasses import asdict, is_dataclass
+from datetime import datetime, timedelta
 from functools import partial
-from typing import List, Dict, Any, Tuple, Optional, AsyncIterator
+from typing import (
+    List, Dict, Any, Tuple, Optional, AsyncIterator, Callable, Awaitable
+)
 import asyncio
 from pprint import pformat
 import inspect
 import itertools
 import logging
+import sys
 import time
 
 import trio
@@ -51,7 +55,7 @@ import numpy as np
 
 from ..log import get_logger, get_console_log
 from .._daemon import maybe_spawn_brokerd
-from ..data._source import from_df
+from ..data._source import base_ohlc_dtype, _nan_to_closest_num
 from ..data._sharedmem import ShmArray
 from ._util import SymbolNotFound, NoData
 from ..clearing._messages import (
@@ -98,6 +102,21 @@ _time_frames = {
 
 _show_wap_in_history: bool = False
 
+# max number of bars per 1s sample history query
+_max_bars_per_query: int = int(2e3)
+
+# max concurrent history queries during backfill, kept low to stay
+# well within IB's request pacing rules
+_backfill_concurrency: int = 4
+
+# per client (``asyncio`` side) in-flight request limits; the
+# ``ib_insync`` client is throttled to 45 rps so keep a margin.
+_hist_req_concurrency: int = 40
+_details_req_concurrency: int = 20
+
+# seconds to remember a failed contract lookup for
+_contract_miss_ttl: float = 60
+
 # optional search config the backend can register for
 # it's symbol search handling (in this case we avoid
 # accepting patterns before the kb has settled more then
@@ -115,14 +134,19 @@ class NonShittyWrapper(Wrapper):
         """Override time stamps to be floats for now.
         """
         # use a ns int to store epoch time instead of datetime
+        # NOTE: this must stay a *wall clock* stamp (not monotonic)
+        # since ``ib_insync`` stamps ticker, trade log and fill times
+        # with it, all of which get shipped to other actors.
         self.lastTime = time.time_ns()
 
+        # clear (and reuse) the per-frame containers in place instead
+        # of allocating new ones for every pending ticker on every frame.
         for ticker in self.pendingTickers:
             ticker.rtTime = None
-            ticker.ticks = []
-            ticker.tickByTicks = []
-            ticker.domTicks = []
-        self.pendingTickers = set()
+            ticker.ticks.clear()
+            ticker.tickByTicks.clear()
+            ticker.domTicks.clear()
+        self.pendingTickers.clear()
 
     def execDetails(
         self,
@@ -135,7 +159,13 @@ class NonShittyWrapper(Wrapper):
         """
         # this is the IB server's execution time supposedly
         # https://interactivebrokers.github.io/tws-api/classIBApi_1_1Execution.html#a2e05cace0aa52d809654c7248e052ef2
-        execu.time = execu.time.timestamp()
+        # NOTE: ``ib_insync`` parses this to a tz-aware (utc) datetime
+        # for which ``.timestamp()`` is pure (C level) offset math, so
+        # only guard against re-converting an already float stamp.
+        exec_time = execu.time
+        if isinstance(exec_time, datetime):
+            execu.time = exec_time.timestamp()
+
         return super().execDetails(reqId, contract, execu)
 
 
@@ -155,6 +185,12 @@ class NonShittyIB(ibis.IB):
         self._logger = logging.getLogger('ib_insync.ib')
 
 
+# default (read-only, class level) history request overrides;
+# contract types which need them (forex, cmdty) set an instance
+# attr in ``Client.find_contract()``.
+Contract.bars_kwargs = {}
+
+
 # map of symbols to contract ids
 _adhoc_cmdty_data_map = {
     # https://misc.interactivebrokers.com/cstools/contract_info/v3.10/index.php?action=Conid%20Info&wlId=IB&conid=69067924
@@ -194,6 +230,38 @@ _exch_skip_list = {
 _enters = 0
 
 
+def bars_to_np(bars: List[ibis.BarData]) -> np.ndarray:
+    """Convert a ``BarDataList`` from ``ib_insync`` into an ohlc struct
+    array matching our shm buffer (sans index) layout.
+
+    Rows are packed in a single pass directly from the bar objects
+    avoiding an intermediary ``pandas.DataFrame`` (and per column
+    lists) such that the result can be pushed as is to shm.
+    """
+    nparr = np.array(
+        [
+            (
+                bar.date.timestamp(),
+                bar.open,
+                bar.high,
+                bar.low,
+                bar.close,
+                bar.volume,
+
+                # XXX: ib_insync calls this the "wap of the bar"
+                # but no clue what is actually is...
+                # https://github.com/pikers/piker/issues/119#issuecomment-729120988
+                bar.average,
+            )
+            for bar in bars
+        ],
+        dtype=base_ohlc_dtype,
+    )
+
+    _nan_to_closest_num(nparr)
+    return nparr
+
+
 class Client:
     """IB wrapped for our broker backend API.
 
@@ -209,9 +277,18 @@ class Client:
 
         # contract cache
         self._contracts: Dict[str, Contract] = {}
+
+        # qualified contracts keyed by normalized ``(sym, exch,
+        # currency)`` and a (short lived) negative cache of lookups
+        # which found nothing, mapped to their expiry time.
+        self._qualified: Dict[Tuple[str, str, str], Contract] = {}
+        self._not_found: Dict[Tuple[str, str, str], float] = {}
         self._feeds: Dict[str, trio.abc.SendChannel] = {}
 
         # NOTE: the ib.client here is "throttled" to 45 rps by default
+        # so self-limit concurrent requests from our side as well.
+        self._hist_sem = asyncio.Semaphore(_hist_req_concurrency)
+        self._details_sem = asyncio.Semaphore(_details_req_concurrency)
 
     async def bars(
         self,
@@ -221,7 +298,7 @@ class Client:
         end_dt: str = "",
 
         sample_period_s: str = 1,  # ohlc sample period
-        period_count: int = int(2e3),  # <- max per 1s sample query
+        period_count: int = _max_bars_per_query,
 
         is_paid_feed: bool = False,  # placeholder
     ) -> List[Dict[str, Any]]:
@@ -234,48 +311,47 @@ class Client:
         _enters += 1
 
         contract = await self.find_contract(symbol)
-        bars_kwargs.update(getattr(contract, 'bars_kwargs', {}))
+        bars_kwargs.update(contract.bars_kwargs)
 
         # _min = min(2000*100, count)
-        bars = await self.ib.reqHistoricalDataAsync(
-            contract,
-            endDateTime=end_dt,
+        async with self._hist_sem:
+            bars = await self.ib.reqHistoricalDataAsync(
+                contract,
+                endDateTime=end_dt,
 
-            # time history length values format:
-            # ``durationStr=integer{SPACE}unit (S|D|W|M|Y)``
+                # time history length values format:
+                # ``durationStr=integer{SPACE}unit (S|D|W|M|Y)``
 
-            # OHLC sampling values:
-            # 1 secs, 5 secs, 10 secs, 15 secs, 30 secs, 1 min, 2 mins,
-            # 3 mins, 5 mins, 10 mins, 15 mins, 20 mins, 30 mins,
-            # 1 hour, 2 hours, 3 hours, 4 hours, 8 hours, 1 day, 1W, 1M
-            # barSizeSetting='1 secs',
+                # OHLC sampling values:
+                # 1 secs, 5 secs, 10 secs, 15 secs, 30 secs, 1 min, 2 mins,
+                # 3 mins, 5 mins, 10 mins, 15 mins, 20 mins, 30 mins,
+                # 1 hour, 2 hours, 3 hours, 4 hours, 8 hours, 1 day, 1W, 1M
+                # barSizeSetting='1 secs',
 
-            # durationStr='{count} S'.format(count=15000 * 5),
-            # durationStr='{count} D'.format(count=1),
-            # barSizeSetting='5 secs',
+                # durationStr='{count} S'.format(count=15000 * 5),
+                # durationStr='{count} D'.format(count=1),
+                # barSizeSetting='5 secs',
 
-            durationStr='{count} S'.format(count=period_count),
-            # barSizeSetting='5 secs',
-            barSizeSetting='1 secs',
+                durationStr='{count} S'.format(count=period_count),
+                # barSizeSetting='5 secs',
+                barSizeSetting='1 secs',
 
-            # barSizeSetting='1 min',
+                # barSizeSetting='1 min',
 
-            # always use extended hours
-            useRTH=False,
+                # always use extended hours
+                useRTH=False,
+
+                # restricted per contract type
+                **bars_kwargs,
+                # whatToShow='MIDPOINT',
+                # whatToShow='TRADES',
+            )
 
-            # restricted per contract type
-            **bars_kwargs,
-            # whatToShow='MIDPOINT',
-            # whatToShow='TRADES',
-        )
         if not bars:
             # TODO: raise underlying error here
             raise ValueError(f"No bars retreived for {symbol}?")
 
-        # TODO: rewrite this faster with ``numba``
-        # convert to pandas dataframe:
-        df = ibis.util.df(bars)
-        return bars, from_df(df)
+        return bars, bars_to_np(bars)
 
     async def search_stocks(
         self,
@@ -291,34 +367,45 @@ class Client:
 
         if descriptions is not None:
 
+            async def get_details(con: Contract) -> List[ContractDetails]:
+                async with self._details_sem:
+                    return await self.ib.reqContractDetailsAsync(con)
+
             futs = []
             for d in descriptions:
                 con = d.contract
                 if con.primaryExchange not in _exch_skip_list:
-                    futs.append(self.ib.reqContractDetailsAsync(con))
+                    futs.append(get_details(con))
 
-            # batch request all details
-            results = await asyncio.gather(*futs)
+            # batch request all details but process them in (IB's
+            # relevance ranked) description order so we can bail (and
+            # cancel the rest) once we've got ``upto`` entries.
+            tasks = [asyncio.ensure_future(f) for f in futs]
+            try:
+                # XXX: if there is more then one entry in the details list
+                details = {}
+                for task in tasks:
+                    details_set = await task
 
-            # XXX: if there is more then one entry in the details list
-            details = {}
-            for details_set in results:
+                    # then the contract is so called "ambiguous".
+                    for d in details_set:
+                        con = d.contract
+                        unique_sym = f'{con.symbol}.{con.primaryExchange}'
 
-                # then the contract is so called "ambiguous".
-                for d in details_set:
-                    con = d.contract
-                    unique_sym = f'{con.symbol}.{con.primaryExchange}'
+                        as_dict = asdict(d)
+                        # nested dataclass we probably don't need and that won't IPC serialize
+                        as_dict.pop('secIdList')
 
-                    as_dict = asdict(d)
-                    # nested dataclass we probably don't need and that won't IPC serialize
-                    as_dict.pop('secIdList')
+                        details[unique_sym] = as_dict
 
-                    details[unique_sym] = as_dict
+                        if len(details) == upto:
+                            return details
 
-                    if len(details) == upto:
-                        return details
+                return details
 
-            return details
+            finally:
+                for task in tasks:
+                    task.cancel()
 
         else:
             return {}
@@ -388,6 +475,24 @@ class Client:
             # likely there's an embedded `.` for a forex pair
             breakpoint()
 
+        key = (sym, exch, currency.upper())
+        fqsn = symbol
+
+        # NOTE: we always hand out a *copy* of a cached contract since
+        # ``ib_insync`` keys its ticker instances by ``id(contract)``
+        # (see the clobbering issue above).
+        qualified = self._qualified.get(key)
+        if qualified is not None:
+            contract = copy(qualified)
+            self._contracts[fqsn] = contract
+            return contract
+
+        expiry = self._not_found.get(key)
+        if expiry is not None:
+            if time.monotonic() < expiry:
+                raise ValueError(f"No contract could be found {symbol}")
+            del self._not_found[key]
+
         # futes
         if exch in ('GLOBEX', 'NYMEX', 'CME', 'CMECRYPTO'):
             con = await self.get_cont_fute(symbol=sym, exchange=exch)
@@ -433,9 +538,11 @@ class Client:
             contract = (await self.ib.qualifyContractsAsync(con))[0]
 
         except IndexError:
+            self._not_found[key] = time.monotonic() + _contract_miss_ttl
             raise ValueError(f"No contract could be found {con}")
 
-        self._contracts[symbol] = contract
+        self._qualified[key] = copy(contract)
+        self._contracts[fqsn] = contract
         return contract
 
     async def get_head_time(
@@ -553,12 +660,15 @@ class Client:
             else:
                 item = ('status', obj)
 
-            log.info(f'eventkit event -> {eventkit_obj}: {item}')
+            # NOTE: guarded and lazily formatted since ``item`` may be
+            # a large object with an expensive repr.
+            if log.isEnabledFor(logging.INFO):
+                log.info('eventkit event -> %s: %s', eventkit_obj, item)
 
             try:
                 to_trio.send_nowait(item)
             except trio.BrokenResourceError:
-                log.exception(f'Disconnected from {eventkit_obj} updates')
+                log.exception('Disconnected from %s updates', eventkit_obj)
                 eventkit_obj.disconnect(push_tradesies)
 
         # hook up to the weird eventkit object - event stream api
@@ -640,6 +750,7 @@ _gw_port: int = 4002
 _try_ports = [_gw_port, _tws_port]
 _client_ids = itertools.count()
 _client_cache = {}
+_client_lock: Optional[asyncio.Lock] = None
 
 
 @asynccontextmanager
@@ -654,48 +765,61 @@ async def _aio_get_client(
 
     TODO: consider doing this with a ctx mngr eventually?
     """
-    # first check cache for existing client
-
-    try:
-        if port:
-            client = _client_cache[(host, port)]
-        else:
-            # grab first cached client
-            client = list(_client_cache.values())[0]
-
-        yield client
-
-    except (KeyError, IndexError):
-        # TODO: in case the arbiter has no record
-        # of existing brokerd we need to broadcast for one.
-
-        if client_id is None:
-            # if this is a persistent brokerd, try to allocate a new id for
-            # each client
-            client_id = next(_client_ids)
-
-        ib = NonShittyIB()
-        ports = _try_ports if port is None else [port]
-
-        _err = None
-        for port in ports:
-            try:
-                log.info(f"Connecting to the EYEBEE on port {port}!")
-                await ib.connectAsync(host, port, clientId=client_id)
-                break
-            except ConnectionRefusedError as ce:
-                _err = ce
-                log.warning(f'Failed to connect on {port}')
-        else:
-            raise ConnectionRefusedError(_err)
+    global _client_lock
+    if _client_lock is None:
+        # allocated lazily such that it binds to the running loop
+        _client_lock = asyncio.Lock()
+
+    # serialize cache lookups such that concurrent first requests
+    # (eg. the quote and history bootstrap tasks) share a connection.
+    ib = None
+    async with _client_lock:
+
+        # first check cache for existing client
+        key = (host, port) if port else next(iter(_client_cache), None)
+        client = _client_cache.get(key)
+
+        if client is not None and not client.ib.isConnected():
+            # don't hand out a stale (disconnected) client
+            log.warning(f'Dropping disconnected client for {key}')
+            _client_cache.pop(key, None)
+            client = None
+
+        if client is None:
+            # TODO: in case the arbiter has no record
+            # of existing brokerd we need to broadcast for one.
+
+            if client_id is None:
+                # if this is a persistent brokerd, try to allocate a new id for
+                # each client
+                client_id = next(_client_ids)
+
+            ib = NonShittyIB()
+            ports = _try_ports if port is None else [port]
+
+            _err = None
+            for port in ports:
+                try:
+                    log.info(f"Connecting to the EYEBEE on port {port}!")
+                    await ib.connectAsync(host, port, clientId=client_id)
+                    break
+                except ConnectionRefusedError as ce:
+                    _err = ce
+                    log.warning(f'Failed to connect on {port}')
+            else:
+                raise ConnectionRefusedError(_err)
 
-        # create and cache
-        try:
+            # create and cache
             client = Client(ib)
 
             _client_cache[(host, port)] = client
             log.debug(f"Caching client for {(host, port)}")
 
+    if ib is None:
+        yield client
+
+    else:
+        try:
             yield client
 
         except BaseException:
@@ -703,6 +827,20 @@ async def _aio_get_client(
             raise
 
 
+# per ``Client`` method arg names and streaming-ness, computed once
+# at import instead of introspected on every proxied call.
+_SPECS: Dict[str, Tuple[str, ...]] = {}
+_IS_ASYNCGEN: Dict[str, bool] = {}
+for _name, _fn in inspect.getmembers(Client, predicate=inspect.isfunction):
+    _SPECS[_name] = tuple(inspect.getfullargspec(_fn).args)
+    _IS_ASYNCGEN[_name] = inspect.isasyncgenfunction(_fn)
+
+# public ``Client`` methods to mock on remote proxies
+_CLIENT_METHODS: Tuple[str, ...] = tuple(
+    name for name in _SPECS if name[0] != '_'
+)
+
+
 async def _aio_run_client_method(
     meth: str,
     to_trio=None,
@@ -714,8 +852,7 @@ async def _aio_run_client_method(
         async_meth = getattr(client, meth)
 
         # handle streaming methods
-        args = tuple(inspect.getfullargspec(async_meth).args)
-        if to_trio and 'to_trio' in args:
+        if to_trio and 'to_trio' in _SPECS[meth]:
             kwargs['to_trio'] = to_trio
 
         log.runtime(f'Running {meth}({kwargs})')
@@ -734,14 +871,10 @@ async def _trio_run_client_method(
     assert ca.is_infected_aio()
 
     # if the method is an *async gen* stream for it
-    meth = getattr(Client, method)
-
-    args = tuple(inspect.getfullargspec(meth).args)
-
-    if inspect.isasyncgenfunction(meth) or (
+    if _IS_ASYNCGEN[method] or (
         # if the method is an *async func* but manually
         # streams back results, make sure to also stream it
-        'to_trio' in args
+        'to_trio' in _SPECS[method]
     ):
         kwargs['_treat_as_stream'] = True
 
@@ -773,6 +906,23 @@ class _MethodProxy:
         )
 
 
+def _mk_method_stub(
+    portal: tractor.Portal,
+    name: str,
+) -> Callable[..., Awaitable[Any]]:
+    """Build a remote method stub closed over its (literal) method
+    name; avoids a ``partial()`` + extra frame per proxied call.
+
+    """
+    run = portal.run
+
+    async def stub(**kwargs) -> Any:
+        return await run(_trio_run_client_method, method=name, **kwargs)
+
+    stub.__name__ = stub.__qualname__ = name
+    return stub
+
+
 def get_client_proxy(
 
     portal: tractor.Portal,
@@ -783,12 +933,18 @@ def get_client_proxy(
     proxy = _MethodProxy(portal)
 
     # mock all remote methods
-    for name, method in inspect.getmembers(
-        target, predicate=inspect.isfunction
-    ):
-        if '_' == name[0]:
-            continue
-        setattr(proxy, name, partial(proxy._run_method, meth=name))
+    if target is Client:
+        names = _CLIENT_METHODS
+    else:
+        names = tuple(
+            name for name, _ in inspect.getmembers(
+                target, predicate=inspect.isfunction
+            )
+            if name[0] != '_'
+        )
+
+    for name in names:
+        setattr(proxy, name, _mk_method_stub(portal, name))
 
     return proxy
 
@@ -822,6 +978,42 @@ tick_types = {
     8: 'volume',
 }
 
+# per-``tickType`` lookup table of interned type names; IB tick
+# types are small ints so an index beats a dict probe per tick.
+_TT_ARR: List[str] = ['n/a'] * 128
+for _tt, _name in tick_types.items():
+    _TT_ARR[_tt] = sys.intern(_name)
+
+
+# (nested) dataclass attrs we never ship to consumers; ``updateEvent``
+# is an (unserializable) instance attr set by ``ib_insync`` itself and
+# ``bars_kwargs`` is our own ``Contract`` history request override.
+_DROP = frozenset(('rtTime', 'updateEvent', 'bars_kwargs'))
+
+
+def _shallow_asdict(val: Any) -> Any:
+    """Convert a (nested) ``ib_insync`` value to something we can
+    serialize without the deep copy of every value done by ``asdict()``.
+
+    Dataclasses (eg. ``Contract.comboLegs``, dom levels) are converted
+    recursively, at any depth, while other values are passed through.
+
+    """
+    if is_dataclass(val):
+        return {
+            k: _shallow_asdict(v) for k, v in val.__dict__.items()
+            if k not in _DROP
+        }
+
+    elif isinstance(val, list):
+        # snapshot since the wrapper clears these lists in place
+        if val and is_dataclass(val[0]):
+            return [_shallow_asdict(v) for v in val]
+
+        return val.copy()
+
+    return val
+
 
 def normalize(
     ticker: Ticker,
@@ -832,31 +1024,35 @@ def normalize(
     for tick in ticker.ticks:
         if tick and not isinstance(tick, dict):
             td = tick._asdict()
-            td['type'] = tick_types.get(td['tickType'], 'n/a')
+            tt = td['tickType']
+            td['type'] = _TT_ARR[tt] if 0 <= tt < 128 else 'n/a'
 
             new_ticks.append(td)
 
-    ticker.ticks = new_ticks
-
     # some contracts don't have volume so we may want to calculate
     # a midpoint price based on data we can acquire (such as bid / ask)
     if calc_price:
-        ticker.ticks.append(
+        new_ticks.append(
             {'type': 'trade', 'price': ticker.marketPrice()}
         )
 
-    # serialize for transport
-    data = asdict(ticker)
-
-    # add time stamps for downstream latency measurements
-    data['brokerd_ts'] = time.time()
+    # serialize for transport; only nested dataclass values
+    # (eg. ``contract``, greeks, dom levels) need converting.
+    data = _shallow_asdict(ticker)
+    # NOTE: the ticker's own ``.ticks`` list is left untouched since
+    # it's reused (cleared in place) by ``NonShittyWrapper``.
+    data['ticks'] = new_ticks
 
     # stupid stupid shit...don't even care any more..
     # leave it until we do a proper latency study
     # if ticker.rtTime is not None:
     #     data['broker_ts'] = data['rtTime_s'] = float(
     #         ticker.rtTime.timestamp) / 1000.
-    data.pop('rtTime')
+
+    # add time stamps for downstream latency measurements
+    # NOTE: wall clock on purpose; it's compared against exchange
+    # (``broker_ts``) stamps in other processes, see ``piker.fsp``.
+    data['brokerd_ts'] = time.time()
 
     return data
 
@@ -947,24 +1143,62 @@ async def backfill_bars(
 
         task_status.started(cs)
 
-        i = 0
-        while i < count:
-
-            out, fails = await get_bars(sym, end_dt=next_dt)
-
-            if fails is None or fails > 1:
+        # request ``count`` contiguous (1s sampled) history windows
+        # ending at the earliest bar retreived above concurrently
+        # instead of walking back in time one request at a time.
+        span = timedelta(seconds=_max_bars_per_query)
+        anchors = [next_dt - i*span for i in range(count)]
+
+        results: Dict[int, np.ndarray] = {}
+        scopes = [trio.CancelScope() for _ in anchors]
+        limiter = trio.CapacityLimiter(_backfill_concurrency)
+
+        # index of the latest window which failed; no window at or
+        # before (in time) it is pushed so that history stays gapless.
+        failed = count
+
+        def fail(i: int) -> None:
+            nonlocal failed
+            failed = min(failed, i)
+
+            # don't bother with any earlier windows.
+            for scope in scopes[i + 1:]:
+                scope.cancel()
+
+        async def get_window(i: int, end_dt: datetime) -> None:
+            with scopes[i]:
+                async with limiter:
+                    out, fails = await get_bars(sym, end_dt=end_dt)
+
+                if fails is None or fails > 1:
+                    # we hit a history "dead zone" or are being
+                    # throttled.
+                    fail(i)
+                    return
+
+                if out == (None, None):
+                    # could be trying to retreive bars over weekend
+                    # TODO: add logic here to handle tradable hours and
+                    # only grab valid bars in the range
+                    log.error(f"Can't grab bars starting at {end_dt}!?!?")
+                    fail(i)
+                    return
+
+                _, bars_array, _ = out
+                results[i] = bars_array
+
+        async with trio.open_nursery() as n:
+            for i, end_dt in enumerate(anchors):
+                n.start_soon(get_window, i, end_dt)
+
+        # prepend in order from latest to earliest window stopping at
+        # the first failed (or otherwise missing) one.
+        for i in range(failed):
+            bars_array = results.get(i)
+            if bars_array is None:
                 break
 
-            if out == (None, None):
-                # could be trying to retreive bars over weekend
-                # TODO: add logic here to handle tradable hours and only grab
-                # valid bars in the range
-                log.error(f"Can't grab bars starting at {next_dt}!?!?")
-                continue
-
-            bars, bars_array, next_dt = out
             shm.push(bars_array, prepend=True)
-            i += 1
 
 
 asset_type_map = {
@@ -989,9 +1223,15 @@ asset_type_map = {
 _quote_streams: Dict[str, trio.abc.ReceiveStream] = {}
 
 
+# default generic tick types requested for L1 streams, see
+# https://interactivebrokers.github.io/tws-api/tick_types.html
+_DEFAULT_OPTS: Tuple[str, ...] = ('375', '233', '236')
+_DEFAULT_OPTS_STR: str = ','.join(_DEFAULT_OPTS)
+
+
 async def _setup_quote_stream(
     symbol: str,
-    opts: Tuple[int] = ('375', '233', '236'),
+    opts: Tuple[str, ...] = _DEFAULT_OPTS,
     contract: Optional[Contract] = None,
 ) -> None:
     """Stream a ticker using the std L1 api.
@@ -1001,19 +1241,26 @@ async def _setup_quote_stream(
     async with _aio_get_client() as client:
 
         contract = contract or (await client.find_contract(symbol))
-        ticker: Ticker = client.ib.reqMktData(contract, ','.join(opts))
+        opts_str = _DEFAULT_OPTS_STR if opts is _DEFAULT_OPTS else (
+            ','.join(opts)
+        )
+        ticker: Ticker = client.ib.reqMktData(contract, opts_str)
 
         # define a simple queue push routine that streams quote packets
         # to trio over the ``to_trio`` memory channel.
         to_trio, from_aio = trio.open_memory_channel(2**8)  # type: ignore
 
-        def push(t):
-            """Push quotes to trio task.
+        loop = asyncio.get_running_loop()
+        flush_scheduled: bool = False
+
+        def flush() -> None:
+            """Deliver the (coalesced) ticker update to the trio task.
 
             """
-            # log.debug(t)
+            nonlocal flush_scheduled
+            flush_scheduled = False
             try:
-                to_trio.send_nowait(t)
+                to_trio.send_nowait(ticker)
 
             except trio.BrokenResourceError:
                 # XXX: eventkit's ``Event.emit()`` for whatever redic
@@ -1021,12 +1268,27 @@ async def _setup_quote_stream(
                 # resulting in tracebacks spammed to console..
                 # Manually do the dereg ourselves.
                 ticker.updateEvent.disconnect(push)
-                log.error(f"Disconnected stream for `{symbol}`")
+                log.error('Disconnected stream for `%s`', symbol)
                 client.ib.cancelMktData(contract)
 
                 # decouple broadcast mem chan
                 _quote_streams.pop(symbol, None)
 
+        def push(t):
+            """Push quotes to trio task.
+
+            Updates are coalesced so that at most one wakeup crosses
+            over to trio per ``asyncio`` loop cycle; the ticker is
+            a single stateful object so later updates supersede
+            earlier ones anyway.
+
+            """
+            # log.debug(t)
+            nonlocal flush_scheduled
+            if not flush_scheduled:
+                flush_scheduled = True
+                loop.call_soon(flush)
+
         ticker.updateEvent.connect(push)
 
         return from_aio
@@ -1059,6 +1321,11 @@ async def start_aio_quote_stream(
         return from_aio
 
 
+# contract types with no real volume (or exchange name) for which
+# a (tick) price must be calculated
+_CALC_PRICE_TYPES = (ibis.Commodity, ibis.Forex)
+
+
 async def stream_quotes(
 
     send_chan: trio.abc.SendChannel,
@@ -1117,26 +1384,20 @@ async def stream_quotes(
 
     con = first_ticker.contract
 
-    # should be real volume for this contract by default
-    calc_price = False
-
-    # check for special contract types
-    if type(first_ticker.contract) not in (ibis.Commodity, ibis.Forex):
-
-        suffix = con.primaryExchange
-        if not suffix:
-            suffix = con.exchange
+    # check for special contract types: commodities and forex don't
+    # have an exchange name and no real volume so we have to
+    # calculate the price, otherwise there should be real volume for
+    # this contract by default.
+    calc_price = isinstance(con, _CALC_PRICE_TYPES)
+    if calc_price:
+        suffix = con.secType
 
     else:
-        # commodities and forex don't have an exchange name and
-        # no real volume so we have to calculate the price
-        suffix = con.secType
-        # no real volume on this tract
-        calc_price = True
+        suffix = con.primaryExchange or con.exchange
 
     quote = normalize(first_ticker, calc_price=calc_price)
     con = quote['contract']
-    topic = '.'.join((con['symbol'], suffix)).lower()
+    topic = f"{con['symbol']}.{suffix}".lower()
     quote['symbol'] = topic
 
     # pass first quote asap
@@ -1144,16 +1405,13 @@ async def stream_quotes(
 
     # ugh, clear ticks since we've consumed them
     # (ahem, ib_insync is stateful trash)
-    first_ticker.ticks = []
+    first_ticker.ticks.clear()
 
     log.debug(f"First ticker received {quote}")
 
     task_status.started((init_msgs,  first_quote))
 
-    if type(first_ticker.contract) not in (ibis.Commodity, ibis.Forex):
-        # suffix = 'exchange'
-        # calc_price = False  # should be real volume for contract
-
+    if not calc_price:
         # wait for real volume on feed (trading might be closed)
         while True:
 
@@ -1169,7 +1427,7 @@ async def stream_quotes(
                 log.debug("Received first real volume tick")
                 # ugh, clear ticks since we've consumed them
                 # (ahem, ib_insync is truly stateful trash)
-                ticker.ticks = []
+                ticker.ticks.clear()
 
                 # XXX: this works because we don't use
                 # ``aclosing()`` above?
@@ -1195,7 +1453,7 @@ async def stream_quotes(
             await send_chan.send({topic: quote})
 
             # ugh, clear ticks since we've consumed them
-            ticker.ticks = []
+            ticker.ticks.clear()
             # last = time.time()
 
 
@@ -1275,6 +1533,102 @@ async def handle_order_requests(
             log.error(f'Unknown order command: {request_msg}')
 
 
+# ib execution side -> piker order action
+_action_map: Dict[str, str] = {
+    sys.intern('BOT'): 'buy',
+    sys.intern('SLD'): 'sell',
+}
+
+
+def _pack_status(trade: Trade) -> BrokerdStatus:
+    # unwrap needed data from ib_insync internal types
+    status: OrderStatus = trade.orderStatus
+
+    # skip duplicate filled updates - we get the deats
+    # from the execution details event
+    return BrokerdStatus(
+
+        reqid=trade.order.orderId,
+        time_ns=time.time_ns(),  # cuz why not
+        status=status.status.lower(),  # force lower case
+
+        filled=status.filled,
+        reason=status.whyHeld,
+        # this seems to not be necessarily up to date in the
+        # execDetails event.. so we have to send it here I guess?
+        remaining=status.remaining,
+
+        broker_details={'name': 'ib'},
+    )
+
+
+def _pack_fill(item: Tuple[Trade, Fill]) -> BrokerdFill:
+
+    # for wtv reason this is a separate event type
+    # from IB, not sure why it's needed other then for extra
+    # complexity and over-engineering :eyeroll:.
+    # we may just end up dropping these events (or
+    # translating them to ``Status`` msgs) if we can
+    # show the equivalent status events are no more latent.
+
+    # unpack ib_insync types
+    # pep-0526 style:
+    # https://www.python.org/dev/peps/pep-0526/#global-and-local-variable-annotations
+    trade: Trade
+    fill: Fill
+    trade, fill = item
+    execu: Execution = fill.execution
+
+    # TODO: normalize out commissions details?
+    details = {
+        'contract': asdict(fill.contract),
+        'execution': asdict(fill.execution),
+        'commissions': asdict(fill.commissionReport),
+        'broker_time': execu.time,   # supposedly IB server fill time
+        'name': 'ib',
+    }
+
+    return BrokerdFill(
+        # should match the value returned from `.submit_limit()`
+        reqid=execu.orderId,
+        time_ns=time.time_ns(),  # cuz why not
+
+        action=_action_map[execu.side],
+        size=execu.shares,
+        price=execu.price,
+
+        broker_details=details,
+        # XXX: required by order mode currently
+        broker_time=details['broker_time'],
+
+    )
+
+
+def _handle_error(err: dict) -> None:
+
+    # f$#$% gawd dammit insync..
+    con = err['contract']
+    if isinstance(con, Contract):
+        err['contract'] = asdict(con)
+
+    if err['reqid'] == -1:
+        log.error(f'TWS external order error:\n{pformat(err)}')
+
+    # don't forward for now, it's unecessary.. but if we wanted to,
+    # msg = BrokerdError(**err)
+    return None
+
+
+# ``Client.recv_trade_updates()`` event name -> msg packer; a packer
+# returning ``None`` means the event is not forwarded to the ems.
+_trade_event_handlers: Dict[str, Callable[[Any], Any]] = {
+    'status': _pack_status,
+    'fill': _pack_fill,
+    'error': _handle_error,
+    'position': pack_position,
+}
+
+
 @tractor.context
 async def trades_dialogue(
 
@@ -1301,8 +1655,6 @@ async def trades_dialogue(
 
     await ctx.started(all_positions)
 
-    action_map = {'BOT': 'buy', 'SLD': 'sell'}
-
     async with (
         ctx.open_stream() as ems_stream,
         trio.open_nursery() as n,
@@ -1314,89 +1666,15 @@ async def trades_dialogue(
 
             # XXX: begin normalization of nonsense ib_insync internal
             # object-state tracking representations...
-
-            if event_name == 'status':
-
-                # unwrap needed data from ib_insync internal types
-                trade: Trade = item
-                status: OrderStatus = trade.orderStatus
-
-                # skip duplicate filled updates - we get the deats
-                # from the execution details event
-                msg = BrokerdStatus(
-
-                    reqid=trade.order.orderId,
-                    time_ns=time.time_ns(),  # cuz why not
-                    status=status.status.lower(),  # force lower case
-
-                    filled=status.filled,
-                    reason=status.whyHeld,
-                    # this seems to not be necessarily up to date in the
-                    # execDetails event.. so we have to send it here I guess?
-                    remaining=status.remaining,
-
-                    broker_details={'name': 'ib'},
-                )
-
-            elif event_name == 'fill':
-
-                # for wtv reason this is a separate event type
-                # from IB, not sure why it's needed other then for extra
-                # complexity and over-engineering :eyeroll:.
-                # we may just end up dropping these events (or
-                # translating them to ``Status`` msgs) if we can
-                # show the equivalent status events are no more latent.
-
-                # unpack ib_insync types
-                # pep-0526 style:
-                # https://www.python.org/dev/peps/pep-0526/#global-and-local-variable-annotations
-                trade: Trade
-                fill: Fill
-                trade, fill = item
-                execu: Execution = fill.execution
-
-                # TODO: normalize out commissions details?
-                details = {
-                    'contract': asdict(fill.contract),
-                    'execution': asdict(fill.execution),
-                    'commissions': asdict(fill.commissionReport),
-                    'broker_time': execu.time,   # supposedly IB server fill time
-                    'name': 'ib',
-                }
-
-                msg = BrokerdFill(
-                    # should match the value returned from `.submit_limit()`
-                    reqid=execu.orderId,
-                    time_ns=time.time_ns(),  # cuz why not
-
-                    action=action_map[execu.side],
-                    size=execu.shares,
-                    price=execu.price,
-
-                    broker_details=details,
-                    # XXX: required by order mode currently
-                    broker_time=details['broker_time'],
-
-                )
-
-            elif event_name == 'error':
-
-                err: dict = item
-
-                # f$#$% gawd dammit insync..
-                con = err['contract']
-                if isinstance(con, Contract):
-                    err['contract'] = asdict(con)
-
-                if err['reqid'] == -1:
-                    log.error(f'TWS external order error:\n{pformat(err)}')
-
-                # don't forward for now, it's unecessary.. but if we wanted to,
-                # msg = BrokerdError(**err)
+            handler = _trade_event_handlers.get(event_name)
+            if handler is None:
+                log.warning(f'Unhandled trade event {event_name}: {item}')
                 continue
 
-            elif event_name == 'position':
-                msg = pack_position(item)
+            msg = handler(item)
+            if msg is None:
+                # don't forward
+                continue
 
             if getattr(msg, 'reqid', 0) < -1:
 
@@ -19,7 +19,7 @@ Kraken backend.
 
 """
 from contextlib import asynccontextmanager
-from dataclasses import asdict, field
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Tuple, Optional
 import time
 
@@ -30,7 +30,6 @@ import asks
 from fuzzywuzzy import process as fuzzy
 import numpy as np
 import tractor
-from pydantic.dataclasses import dataclass
 from pydantic import BaseModel
 import wsproto
 
@@ -128,6 +127,57 @@ class OHLC:
     # (sampled) generated tick data
     ticks: List[Any] = field(default_factory=list)
 
+    def to_quote(self) -> Dict[str, Any]:
+        """Flatten to a quote ``dict`` from the known (scalar) fields;
+        avoids the reflective, copying walk done by ``asdict()``.
+
+        """
+        return {
+            'chan_id': self.chan_id,
+            'chan_name': self.chan_name,
+            'pair': self.pair,
+            'time': self.time,
+            'etime': self.etime,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'vwap': self.vwap,
+            'volume': self.volume,
+            'count': self.count,
+            'ticks': self.ticks,
+        }
+
+    @classmethod
+    def from_msg(
+        cls,
+        chan_id: int,
+        chan_name: str,
+        pair: str,
+        payload: List[str],
+    ) -> 'OHLC':
+        """Build from a raw ws ``ohlc`` payload casting each (str)
+        field to its native type inline instead of via (per
+        instance, reflective) validation.
+
+        """
+        t, et, o, h, lo, c, wap, vlm, count = payload
+
+        return cls(
+            int(chan_id),
+            chan_name,
+            pair,
+            float(t),
+            float(et),
+            float(o),
+            float(h),
+            float(lo),
+            float(c),
+            float(wap),
+            float(vlm),
+            int(count),
+        )
+
 
 class Client:
 
@@ -237,36 +287,43 @@ class Client:
             res.pop('last')
             bars = next(iter(res.values()))
 
-            new_bars = []
-
-            first = bars[0]
-            last_nz_vwap = first[-3]
-            if last_nz_vwap == 0:
-                # use close if vwap is zero
-                last_nz_vwap = first[-4]
-
-            # convert all fields to native types
-            for i, bar in enumerate(bars):
-                # normalize weird zero-ed vwap values..cmon kraken..
-                # indicates vwap didn't change since last bar
-                vwap = float(bar.pop(-3))
-                if vwap != 0:
-                    last_nz_vwap = vwap
-                if vwap == 0:
-                    vwap = last_nz_vwap
-
+            # convert all fields to native types column-wise; the raw
+            # rows are ``[time, open, high, low, close, vwap, volume,
+            # count]`` with all float fields as strings.
+            raw = np.array(bars)
+            n = len(raw)
+            vwap = raw[:, 5].astype(float)
+
+            # normalize weird zero-ed vwap values..cmon kraken..
+            # indicates vwap didn't change since last bar so forward
+            # fill from the last non-zero value (use close if the first
+            # vwap is zero).
+            if vwap[0] == 0:
+                vwap[0] = float(raw[0, 4])
+
+            nz_idx = np.where(vwap != 0, np.arange(n), 0)
+            np.maximum.accumulate(nz_idx, out=nz_idx)
+            vwap = vwap[nz_idx]
+
+            if not as_np:
                 # re-insert vwap as the last of the fields
-                bar.append(vwap)
-
-                new_bars.append(
-                    (i,) + tuple(
-                        ftype(bar[j]) for j, (name, ftype) in enumerate(
-                            _ohlc_dtype[1:]
-                        )
-                    )
-                )
-            array = np.array(new_bars, dtype=_ohlc_dtype) if as_np else bars
+                return [
+                    bar[:5] + bar[6:] + [wap]
+                    for bar, wap in zip(bars, vwap.tolist())
+                ]
+
+            array = np.empty(n, dtype=_ohlc_dtype)
+            array['index'] = np.arange(n)
+            array['time'] = raw[:, 0].astype(int)
+            array['open'] = raw[:, 1].astype(float)
+            array['high'] = raw[:, 2].astype(float)
+            array['low'] = raw[:, 3].astype(float)
+            array['close'] = raw[:, 4].astype(float)
+            array['volume'] = raw[:, 6].astype(float)
+            array['count'] = raw[:, 7].astype(int)
+            array['bar_wap'] = vwap
             return array
+
         except KeyError:
             raise SymbolNotFound(json['error'][0] + f': {symbol}')
 
@@ -281,6 +338,27 @@ async def get_client() -> Client:
     yield client
 
 
+# ws pair name -> (broker symbol, piker topic) cache
+_pair_keys: Dict[str, Tuple[str, str]] = {}
+
+
+def pair_keys(pair: str) -> Tuple[str, str]:
+    """Return the broker symbol and (lower case) piker topic for a ws
+    pair name; these are invariant per subscription so only compute
+    them once.
+
+    """
+    try:
+        return _pair_keys[pair]
+    except KeyError:
+        # seriously eh? what's with this non-symmetry everywhere
+        # in subscription systems...
+        # XXX: piker style is always lowercases symbols.
+        sym = pair.replace('/', '')
+        keys = _pair_keys[pair] = (sym, sym.lower())
+        return keys
+
+
 async def stream_messages(ws):
 
     too_slow_count = last_hb = 0
@@ -306,7 +384,9 @@ async def stream_messages(ws):
         if isinstance(msg, dict):
             if msg.get('event') == 'heartbeat':
 
-                now = time.time()
+                # only used for (in-process) deltas so use the
+                # monotonic clock; it can't jump with NTP steps.
+                now = time.monotonic()
                 delay = now - last_hb
                 last_hb = now
 
@@ -324,7 +404,9 @@ async def stream_messages(ws):
 
             if 'ohlc' in chan_name:
 
-                yield 'ohlc', OHLC(chan_id, chan_name, pair, *payload_array[0])
+                yield 'ohlc', OHLC.from_msg(
+                    chan_id, chan_name, pair, payload_array[0]
+                )
 
             elif 'spread' in chan_name:
 
@@ -332,7 +414,7 @@ async def stream_messages(ws):
 
                 # TODO: really makes you think IB has a horrible API...
                 quote = {
-                    'symbol': pair.replace('/', ''),
+                    'symbol': pair_keys(pair)[0],
                     'ticks': [
                         {'type': 'bid', 'price': bid, 'size': bsize},
                         {'type': 'bsize', 'price': bid, 'size': bsize},
@@ -354,18 +436,14 @@ async def stream_messages(ws):
 def normalize(
     ohlc: OHLC,
 ) -> dict:
-    quote = asdict(ohlc)
+    quote = ohlc.to_quote()
     quote['broker_ts'] = quote['time']
     quote['brokerd_ts'] = time.time()
-    quote['symbol'] = quote['pair'] = quote['pair'].replace('/', '')
+    sym, topic = pair_keys(ohlc.pair)
+    quote['symbol'] = quote['pair'] = sym
     quote['last'] = quote['close']
     quote['bar_wap'] = ohlc.vwap
 
-    # seriously eh? what's with this non-symmetry everywhere
-    # in subscription systems...
-    # XXX: piker style is always lowercases symbols.
-    topic = quote['pair'].replace('/', '').lower()
-
     # print(quote)
     return topic, quote
 
@@ -520,6 +598,17 @@ async def stream_quotes(
 
                 if typ == 'ohlc':
 
+                    if (
+                        ohlc.etime == ohlc_last.etime
+                        and ohlc.volume == ohlc_last.volume
+                        and ohlc.close == ohlc_last.close
+                    ):
+                        # repeat snapshot of the same interval with no
+                        # new trades; nothing (tick or bar) to update
+                        # so don't bother forwarding it.
+                        ohlc_last = ohlc
+                        continue
+
                     # TODO: can get rid of all this by using
                     # ``trades`` subscription...
 
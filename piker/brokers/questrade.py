@@ -43,7 +43,7 @@ import asks
 
 from ..calc import humanize, percent_change
 from . import config
-from ._util import resproc, BrokerError, SymbolNotFound
+from ._util import resproc, aresproc, BrokerError, SymbolNotFound
 from ..log import get_logger, colorize_json, get_console_log
 from .._async_utils import async_lifo_cache
 from . import get_brokermod
@@ -258,7 +258,8 @@ class _API:
             # ^ what I get when trying to use too many ids manually...
             json={'filters': filters, 'optionIds': option_ids}
         )
-        return resproc(resp, log)['optionQuotes']
+        # chain responses can be big so decode off the event loop
+        return (await aresproc(resp, log))['optionQuotes']
 
 
 class Client:
@@ -267,6 +268,9 @@ class Client:
 
     Provides a high-level api which wraps the underlying endpoint calls.
     """
+    # ``symbol_info()`` accepts a sequence of symbols
+    symbol_info_batched: bool = True
+
     def __init__(
         self,
         config: dict,
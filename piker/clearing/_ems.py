@@ -21,10 +21,10 @@ In da suit parlances: "Execution management systems"
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from pprint import pformat
+import logging
 import time
-from typing import AsyncIterator, Callable, Any
+from typing import AsyncIterator, Any, NamedTuple
 
-from bidict import bidict
 from pydantic import BaseModel
 import trio
 from trio_typing import TaskStatus
@@ -32,13 +32,12 @@ import tractor
 
 from .. import data
 from ..log import get_logger
-from ..data._normalize import iterticks
 from ..data.feed import Feed
 from .._daemon import maybe_spawn_brokerd
 from . import _paper_engine as paper
 from ._messages import (
     Status, Order,
-    BrokerdCancel, BrokerdOrder, BrokerdOrderAck, BrokerdStatus,
+    BrokerdCancel, BrokerdOrder, BrokerdOrderAck,
     BrokerdFill, BrokerdError, BrokerdPosition,
 )
 
@@ -51,35 +50,50 @@ def mk_check(
     trigger_price: float,
     known_last: float,
     action: str,
-) -> Callable[[float, float], bool]:
-    """Create a predicate for given ``exec_price`` based on last known
-    price, ``known_last``.
+) -> tuple[float, int]:
+    """Create a trigger condition for given ``exec_price`` based on last
+    known price, ``known_last``.
 
-    This is an automatic alert level thunk generator based on where the
+    This is an automatic alert level generator based on where the
     current last known value is and where the specified value of
-    interest is; pick an appropriate comparison operator based on
-    avoiding the case where the a predicate returns true immediately.
+    interest is; pick an appropriate comparison direction based on
+    avoiding the case where the a condition is true immediately.
+
+    The returned ``direction`` is ``1`` if the condition is
+    ``price >= trigger_price``, ``-1`` for ``price <= trigger_price``
+    and ``0`` if no sensible comparison exists (eg. a nan last price),
+    such that a trigger matches when
+    ``direction * (price - trigger_price) >= 0`` for nonzero directions.
 
     """
     # str compares:
     # https://stackoverflow.com/questions/46708708/compare-strings-in-numba-compiled-function
 
     if trigger_price >= known_last:
+        return trigger_price, 1
 
-        def check_gt(price: float) -> bool:
-            return price >= trigger_price
+    elif trigger_price <= known_last:
+        return trigger_price, -1
 
-        return check_gt
+    else:
+        return trigger_price, 0
 
-    elif trigger_price <= known_last:
 
-        def check_lt(price: float) -> bool:
-            return price <= trigger_price
+class _DarkOrder(NamedTuple):
+    '''Dark book (trigger condition) entry.
 
-        return check_lt
+    A plain tuple underneath such that the scan loop can unpack it
+    cheaply while everything else gets named field access.
 
-    else:
-        return None
+    '''
+    trigger_price: float
+    direction: int  # see ``mk_check()``
+    tickfilter: frozenset[str]
+    cmd: dict  # original client request msg
+    abs_diff_away: float
+
+    # ``Status`` msg relayed on trigger
+    status: dict
 
 
 @dataclass
@@ -97,14 +111,15 @@ class _DarkBook:
     broker: str
 
     # levels which have an executable action (eg. alert, order, signal)
+    # bucketed by the tick types which can trigger them such that the
+    # scan loop only ever checks conditions pertinent to a given tick.
     orders: dict[
         str,  # symbol
         dict[
-            str,  # uuid
-            tuple[
-                Callable[[float], bool],  # predicate
-                str,  # name
-                dict,  # cmd / msg type
+            str,  # tick type
+            dict[
+                str,  # uuid
+                _DarkOrder,
             ]
         ]
     ] = field(default_factory=dict)
@@ -117,7 +132,12 @@ class _DarkBook:
 
     # mapping of piker ems order ids to current brokerd order flow message
     _ems_entries: dict[str, str] = field(default_factory=dict)
-    _ems2brokerd_ids: dict[str, str] = field(default_factory=bidict)
+
+    # 2-way mapping of ems order ids <-> broker request ids; kept as
+    # plain dicts (always written together) instead of a ``bidict``
+    # since the reverse lookup is done per msg in the brokerd relay loop.
+    _oid2reqid: dict[str, str] = field(default_factory=dict)
+    _reqid2oid: dict[str, str] = field(default_factory=dict)
 
 
 # XXX: this is in place to prevent accidental positions that are too
@@ -126,6 +146,14 @@ class _DarkBook:
 # slinging NQ futes or something.
 _DEFAULT_SIZE: float = 1.0
 
+# dark order price filter(s)
+_DARK_TYPES: frozenset[str] = frozenset({'ask', 'bid', 'trade', 'last'})
+
+# tick types which may trigger each kind of dark order condition
+_buy_ttypes: frozenset[str] = frozenset({'ask', 'last', 'trade'})
+_sell_ttypes: frozenset[str] = frozenset({'bid', 'last', 'trade'})
+_alert_ttypes: frozenset[str] = frozenset({'trade', 'utrade', 'last'})
+
 
 async def clear_dark_triggers(
 
@@ -145,6 +173,9 @@ async def clear_dark_triggers(
     to broker.
 
     """
+    lasts = book.lasts
+    entries = book._ems_entries
+
     # this stream may eventually contain multiple symbols
     # XXX: optimize this for speed!
     async for quotes in quote_stream:
@@ -158,52 +189,90 @@ async def clear_dark_triggers(
             if execs is None:
                 continue
 
-            for tick in iterticks(
-                quote,
-                # dark order price filter(s)
-                types=('ask', 'bid', 'trade', 'last')
-            ):
+            lasts_key = (broker, sym)
+
+            # NOTE: inlined ``iterticks()`` to avoid a generator frame
+            # per symbol-quote on this (very) hot path.
+            for tick in quote.get('ticks', ()):
+
+                ttype = tick.get('type')
+                if ttype not in _DARK_TYPES:
+                    continue
+
                 price = tick.get('price')
-                ttype = tick['type']
 
                 # update to keep new cmds informed
-                book.lasts[(broker, symbol)] = price
+                lasts[lasts_key] = price
+
+                # only conditions which filter on this tick type
+                bucket = execs.get(ttype)
+                if not bucket:
+                    continue
+
+                # scan all conditions for this tick *without* yielding
+                # such that ``bucket`` can be iterated directly (it may
+                # otherwise be mutated by ``process_client_order_cmds()``
+                # during a send) and triggered entries popped after.
+                triggered: list[tuple[str, dict, float, dict]] = []
 
                 for oid, (
-                    pred,
+                    trigger_price,
+                    direction,
                     tf,
                     cmd,
-                    percent_away,
-                    abs_diff_away
-                ) in (
-                    tuple(execs.items())
-                ):
-
-                    if not pred or (ttype not in tf) or (not pred(price)):
+                    abs_diff_away,
+                    status,
+                ) in bucket.items():
+
+                    # NOTE: written as a negated ``>=`` such that a nan
+                    # tick price never matches (``nan < 0`` is also false).
+                    if (
+                        not direction
+                        or not direction * (price - trigger_price) >= 0
+                    ):
                         # majority of iterations will be non-matches
                         continue
 
-                    action: str = cmd['action']
-                    symbol: str = cmd['symbol']
+                    triggered.append((oid, cmd, abs_diff_away, status))
+
+                if not triggered:
+                    continue
+
+                # build all msgs for this tick's triggers up front such
+                # that every order request is relayed to the broker
+                # before any (less latency sensitive) client statuses.
+                brokerd_msgs: list[dict] = []
+                statuses: list[dict] = []
+
+                # all triggers cleared on the same tick
+                now = time.time_ns()
 
-                    if action == 'alert':
-                        # nothing to do but relay a status
-                        # message back to the requesting ems client
-                        resp = 'alert_triggered'
+                for oid, cmd, abs_diff_away, status in triggered:
 
-                    else:  # executable order submission
+                    # remove exec-condition from all tick type sets
+                    log.info('removing pred for %s', oid)
+                    for bucket in execs.values():
+                        bucket.pop(oid, None)
+
+                    action: str = cmd['action']
+                    size: float = cmd['size']
+
+                    # alerts have nothing to do but relay a status
+                    # message back to the requesting ems client
+                    if action != 'alert':  # executable order submission
 
-                        # submit_price = price + price*percent_away
                         submit_price = price + abs_diff_away
 
                         log.info(
-                            f'Dark order triggered for price {price}\n'
-                            f'Submitting order @ price {submit_price}')
+                            'Dark order triggered for price %s\n'
+                            'Submitting order @ price %s',
+                            price, submit_price,
+                        )
 
-                        msg = BrokerdOrder(
-                            action=cmd['action'],
+                        msg = BrokerdOrder.construct(
+                            action=action,
                             oid=oid,
-                            time_ns=time.time_ns(),
+                            time_ns=now,
 
                             # this **creates** new order request for the
                             # underlying broker so we set a "broker
@@ -215,9 +284,9 @@ async def clear_dark_triggers(
 
                             symbol=sym,
                             price=submit_price,
-                            size=cmd['size'],
+                            size=size,
                         )
-                        await brokerd_orders_stream.send(msg.dict())
+                        brokerd_msgs.append(msg.to_dict())
 
                         # mark this entry as having sent an order
                         # request.  the entry will be replaced once the
@@ -225,36 +294,22 @@ async def clear_dark_triggers(
                         # a ``BrokerdOrderAck`` msg including the
                         # allocated unique ``BrokerdOrderAck.reqid`` key
                         # generated by the broker's own systems.
-                        book._ems_entries[oid] = msg
+                        entries[oid] = msg
 
-                        # our internal status value for client-side
-                        # triggered "dark orders"
-                        resp = 'dark_triggered'
+                    # fill in the trigger specific fields of the
+                    # status msg pre-built at order submission
+                    status['time_ns'] = now
+                    status['trigger_price'] = price
+                    statuses.append(status)
 
-                    msg = Status(
-                        oid=oid,  # ems order id
-                        resp=resp,
-                        time_ns=time.time_ns(),
-
-                        symbol=symbol,
-                        trigger_price=price,
-
-                        broker_details={'name': broker},
-
-                        cmd=cmd,  # original request message
-
-                    ).dict()
-
-                    # remove exec-condition from set
-                    log.info(f'removing pred for {oid}')
-                    execs.pop(oid)
+                for msg in brokerd_msgs:
+                    await brokerd_orders_stream.send(msg)
 
+                for msg in statuses:
                     await ems_client_order_stream.send(msg)
 
-                else:  # condition scan loop complete
-                    log.debug(f'execs are {execs}')
-                    if execs:
-                        book.orders[symbol] = execs
+                # condition scan loop complete
+                log.debug('execs are %s', execs)
 
         # print(f'execs scan took: {time.time() - start}')
 
@@ -507,15 +562,21 @@ async def translate_and_relay_brokerd_events(
 
     assert relay.brokerd_dialogue == brokerd_trades_stream
 
+    entries = book._ems_entries
+    reqid2oid = book._reqid2oid
+
     async for brokerd_msg in brokerd_trades_stream:
 
         name = brokerd_msg['name']
 
-        log.info(f'Received broker trade event:\n{pformat(brokerd_msg)}')
+        # NOTE: guarded since ``pformat()`` is expensive and this runs
+        # for every single brokerd msg.
+        if log.isEnabledFor(logging.INFO):
+            log.info('Received broker trade event:\n%s', pformat(brokerd_msg))
 
         if name == 'position':
 
-            pos_msg = BrokerdPosition(**brokerd_msg).dict()
+            pos_msg = BrokerdPosition(**brokerd_msg).to_dict()
 
             # keep up to date locally in ``emsd``
             relay.positions.setdefault(pos_msg['symbol'], {}).update(pos_msg)
@@ -531,13 +592,14 @@ async def translate_and_relay_brokerd_events(
         # into messaging provided by the broker backend
         reqid = brokerd_msg['reqid']
 
-        # all piker originated requests will have an ems generated oid field
-        oid = brokerd_msg.get(
-            'oid',
-            book._ems2brokerd_ids.inverse.get(reqid)
-        )
+        # all piker originated requests will have an ems generated oid
+        # field, only fall back to the reqid mapping when it's missing.
+        oid = brokerd_msg.get('oid')
+        if oid is None:
+            oid = reqid2oid.get(reqid)
 
         if oid is None:
+            details = brokerd_msg.get('broker_details') or {}
 
             # XXX: paper clearing special cases
             # paper engine race case: ``Client.submit_limit()`` hasn't
@@ -545,7 +607,7 @@ async def translate_and_relay_brokerd_events(
             # locally, so we need to retreive the oid that was already
             # packed at submission since we already know it ahead of
             # time
-            paper = brokerd_msg['broker_details'].get('paper_info')
+            paper = details.get('paper_info')
             if paper:
                 # paperboi keeps the ems id up front
                 oid = paper['oid']
@@ -554,14 +616,14 @@ async def translate_and_relay_brokerd_events(
                 # may be an order msg specified as "external" to the
                 # piker ems flow (i.e. generated by some other
                 # external broker backend client (like tws for ib)
-                ext = brokerd_msg['broker_details'].get('external')
+                ext = details.get('external')
                 if ext:
                     log.error(f"External trade event {ext}")
 
                 continue
         else:
             # check for existing live flow entry
-            entry = book._ems_entries.get(oid)
+            entry = entries.get(oid)
 
             # initial response to brokerd order request
             if name == 'ack':
@@ -571,7 +633,8 @@ async def translate_and_relay_brokerd_events(
                 # local ems order id for reverse lookup later.
                 # a ``BrokerdOrderAck`` **must** be sent after an order
                 # request in order to establish this id mapping.
-                book._ems2brokerd_ids[oid] = reqid
+                book._oid2reqid[oid] = reqid
+                reqid2oid[reqid] = oid
 
                 # new order which has not yet be registered into the
                 # local ems book, insert it now and handle 2 cases:
@@ -585,13 +648,13 @@ async def translate_and_relay_brokerd_events(
                     entry.reqid = reqid
 
                     # tell broker to cancel immediately
-                    await brokerd_trades_stream.send(entry.dict())
+                    await brokerd_trades_stream.send(entry.to_dict())
 
                 # - the order is now active and will be mirrored in
                 # our book -> registered as live flow
                 else:
                     # update the flow with the ack msg
-                    book._ems_entries[oid] = BrokerdOrderAck(**brokerd_msg)
+                    entries[oid] = BrokerdOrderAck(**brokerd_msg)
 
                 continue
 
@@ -630,17 +693,21 @@ async def translate_and_relay_brokerd_events(
         elif name in (
             'status',
         ):
-            msg = BrokerdStatus(**brokerd_msg)
+            # NOTE: status msgs are by far the most frequent from
+            # ``brokerd`` and are only inspected for their ``status`` and
+            # ``remaining`` fields before being relayed as is, so we skip
+            # building (and re-serializing) a ``BrokerdStatus`` for them.
+            status = brokerd_msg['status']
 
-            if msg.status == 'cancelled':
+            if status == 'cancelled':
 
                 log.info(f'Cancellation for {oid} is complete!')
 
-            if msg.status == 'filled':
+            if status == 'filled':
 
                 # conditional execution is fully complete, no more
                 # fills for the noted order
-                if not msg.remaining:
+                if not brokerd_msg.get('remaining'):
 
                     resp = 'broker_executed'
 
@@ -650,14 +717,14 @@ async def translate_and_relay_brokerd_events(
 
                 # just log it
                 else:
-                    log.info(f'{broker} filled {msg}')
+                    log.info('%s filled %s', broker, brokerd_msg)
 
             else:
                 # one of {submitted, cancelled}
-                resp = 'broker_' + msg.status
+                resp = 'broker_' + status
 
             # pass the BrokerdStatus msg inside the broker details field
-            broker_details = msg.dict()
+            broker_details = brokerd_msg
 
         elif name in (
             'fill',
@@ -666,9 +733,9 @@ async def translate_and_relay_brokerd_events(
 
             # proxy through the "fill" result(s)
             resp = 'broker_filled'
-            broker_details = msg.dict()
+            broker_details = msg.to_dict()
 
-            log.info(f'\nFill for {oid} cleared with:\n{pformat(resp)}')
+            log.info('\nFill for %s cleared with:\n%s', oid, resp)
 
         else:
             raise ValueError(f'Brokerd message {brokerd_msg} is invalid')
@@ -678,13 +745,13 @@ async def translate_and_relay_brokerd_events(
         try:
             ems_client_order_stream = router.dialogues[oid]
             await ems_client_order_stream.send(
-                Status(
+                Status.construct(
                     oid=oid,
                     resp=resp,
                     time_ns=time.time_ns(),
                     broker_reqid=reqid,
                     brokerd_msg=broker_details,
-                ).dict()
+                ).to_dict()
             )
         except KeyError:
             log.error(
@@ -696,10 +763,26 @@ async def translate_and_relay_brokerd_events(
     # router.dialogues.pop(oid)
 
 
+async def forward_to_brokerd(
+
+    brokerd_order_rx: trio.MemoryReceiveChannel,
+    brokerd_order_stream: tractor.MsgStream,
+
+) -> None:
+    '''Relay client order request msgs queued by
+    ``process_client_order_cmds()`` to ``brokerd`` such that reading
+    client cmds never waits on a (backpressured) brokerd send.
+
+    '''
+    async with brokerd_order_rx:
+        async for msg in brokerd_order_rx:
+            await brokerd_order_stream.send(msg)
+
+
 async def process_client_order_cmds(
 
     client_order_stream: tractor.MsgStream,  # noqa
-    brokerd_order_stream: tractor.MsgStream,
+    brokerd_order_tx: trio.MemorySendChannel,
 
     symbol: str,
     feed: Feed,  # noqa
@@ -709,11 +792,16 @@ async def process_client_order_cmds(
 ) -> None:
 
     client_dialogues = router.dialogues
+    entries = dark_book._ems_entries
+    oid2reqid = dark_book._oid2reqid
+    orders = dark_book.orders
+    lasts = dark_book.lasts
 
     # cmd: dict
     async for cmd in client_order_stream:
 
-        log.info(f'Received order cmd:\n{pformat(cmd)}')
+        if log.isEnabledFor(logging.INFO):
+            log.info('Received order cmd:\n%s', pformat(cmd))
 
         action = cmd['action']
         oid = cmd['oid']
@@ -729,8 +817,8 @@ async def process_client_order_cmds(
         # others who are registered for such order affiliated msgs).
         client_dialogues[oid] = client_order_stream
 
-        reqid = dark_book._ems2brokerd_ids.inverse.get(oid)
-        live_entry = dark_book._ems_entries.get(oid)
+        reqid = oid2reqid.get(oid)
+        live_entry = entries.get(oid)
 
         # TODO: can't wait for this stuff to land in 3.10
         # https://www.python.org/dev/peps/pep-0636/#going-to-the-cloud-mappings
@@ -740,7 +828,7 @@ async def process_client_order_cmds(
             if live_entry:
                 reqid = live_entry.reqid
 
-                msg = BrokerdCancel(
+                msg = BrokerdCancel.construct(
                     oid=oid,
                     reqid=reqid,
                     time_ns=time.time_ns(),
@@ -751,34 +839,35 @@ async def process_client_order_cmds(
                 if reqid:
 
                     # send cancel to brokerd immediately!
-                    log.info("Submitting cancel for live order {reqid}")
+                    log.info('Submitting cancel for live order %s', reqid)
 
-                    await brokerd_order_stream.send(msg.dict())
+                    await brokerd_order_tx.send(msg.to_dict())
 
                 else:
                     # this might be a cancel for an order that hasn't been
                     # acked yet by a brokerd, so register a cancel for when
                     # the order ack does show up later such that the brokerd
                     # order request can be cancelled at that time.
-                    dark_book._ems_entries[oid] = msg
+                    entries[oid] = msg
 
             # dark trigger cancel
             else:
                 try:
                     # remove from dark book clearing
-                    dark_book.orders[symbol].pop(oid, None)
+                    for bucket in orders[symbol].values():
+                        bucket.pop(oid, None)
 
                     # tell client side that we've cancelled the
                     # dark-trigger order
                     await client_order_stream.send(
-                        Status(
+                        Status.construct(
                             resp='dark_cancelled',
                             oid=oid,
                             time_ns=time.time_ns(),
-                        ).dict()
+                        ).to_dict()
                     )
                     # de-register this client dialogue
-                    router.dialogues.pop(oid)
+                    client_dialogues.pop(oid)
 
                 except KeyError:
                     log.exception(f'No dark order for {symbol}?')
@@ -806,7 +895,7 @@ async def process_client_order_cmds(
                     log.info(
                         f"Modifying live {broker} order: {live_entry.reqid}")
 
-                msg = BrokerdOrder(
+                msg = BrokerdOrder.construct(
                     oid=oid,  # no ib support for oids...
                     time_ns=time.time_ns(),
 
@@ -825,8 +914,10 @@ async def process_client_order_cmds(
                 # (``translate_and_relay_brokerd_events()`` above) will
                 # handle relaying the ems side responses back to
                 # the client/cmd sender from this request
-                log.info(f'Sending live order to {broker}:\n{pformat(msg)}')
-                await brokerd_order_stream.send(msg.dict())
+                if log.isEnabledFor(logging.INFO):
+                    log.info(
+                        'Sending live order to %s:\n%s', broker, pformat(msg))
+                await brokerd_order_tx.send(msg.to_dict())
 
                 # an immediate response should be ``BrokerdOrderAck``
                 # with ems order id from the ``trades_dialogue()``
@@ -835,7 +926,7 @@ async def process_client_order_cmds(
                 # client, before that ack, when the ack does arrive we
                 # immediately take the reqid from the broker and cancel
                 # that live order asap.
-                dark_book._ems_entries[oid] = msg
+                entries[oid] = msg
 
             # "DARK" triggers
             # submit order to local EMS book and scan loop,
@@ -850,15 +941,18 @@ async def process_client_order_cmds(
                 # price received from the feed, instead of being
                 # like every other shitty tina platform that makes
                 # the user choose the predicate operator.
-                last = dark_book.lasts[(broker, sym)]
-                pred = mk_check(trigger_price, last, action)
+                last = lasts[(broker, sym)]
+                trigger_price, direction = mk_check(
+                    trigger_price,
+                    last,
+                    action,
+                )
 
                 spread_slap: float = 5
                 min_tick = feed.symbols[sym].tick_size
 
                 if action == 'buy':
-                    tickfilter = ('ask', 'last', 'trade')
-                    percent_away = 0.005
+                    tickfilter = _buy_ttypes
 
                     # TODO: we probably need to scale this based
                     # on some near term historical spread
@@ -866,29 +960,47 @@ async def process_client_order_cmds(
                     abs_diff_away = spread_slap * min_tick
 
                 elif action == 'sell':
-                    tickfilter = ('bid', 'last', 'trade')
-                    percent_away = -0.005
+                    tickfilter = _sell_ttypes
                     abs_diff_away = -spread_slap * min_tick
 
                 else:  # alert
-                    tickfilter = ('trade', 'utrade', 'last')
-                    percent_away = 0
+                    tickfilter = _alert_ttypes
                     abs_diff_away = 0
 
                 # submit execution/order to EMS scan loop
 
                 # NOTE: this may result in an override of an existing
-                # dark book entry if the order id already exists
-
-                dark_book.orders.setdefault(
-                    sym, {}
-                )[oid] = (
-                    pred,
+                # dark book entry if the order id already exists, in
+                # which case it's first removed from any tick type
+                # buckets the previous version was filed under.
+                execs = orders.setdefault(sym, {})
+                for bucket in execs.values():
+                    bucket.pop(oid, None)
+
+                # pre-build the trigger status msg so that only the
+                # clearing time and price need be filled in on the
+                # (latency critical) trigger path.
+                status = Status.construct(
+                    oid=oid,  # ems order id
+                    # our internal status value for client-side
+                    # triggered "dark orders"
+                    resp=(
+                        'alert_triggered' if action == 'alert'
+                        else 'dark_triggered'
+                    ),
+                    time_ns=0,
+                ).to_dict()
+
+                entry = _DarkOrder(
+                    trigger_price,
+                    direction,
                     tickfilter,
                     cmd,
-                    percent_away,
-                    abs_diff_away
+                    abs_diff_away,
+                    status,
                 )
+                for ttype in tickfilter:
+                    execs.setdefault(ttype, {})[oid] = entry
                 resp = 'dark_submitted'
 
                 # alerts have special msgs to distinguish
@@ -896,11 +1008,11 @@ async def process_client_order_cmds(
                     resp = 'alert_submitted'
 
                 await client_order_stream.send(
-                    Status(
+                    Status.construct(
                         resp=resp,
                         oid=oid,
                         time_ns=time.time_ns(),
-                    ).dict()
+                    ).to_dict()
                 )
 
 
@@ -946,6 +1058,10 @@ async def _emsd_main(
         - ``process_client_order_cmds()``:
           accepts order cmds from requesting piker clients, registers
           execs with exec loop
+       |
+        - ``forward_to_brokerd()``:
+          sends the live order requests queued by the cmd processing task
+          to brokerd.
 
     '''
     global _router
@@ -1025,22 +1141,32 @@ async def _emsd_main(
                     book
                 )
 
+                # client order requests are queued and sent to brokerd
+                # from a separate task
+                brokerd_order_tx, brokerd_order_rx = trio.open_memory_channel(
+                    64,
+                )
+                n.start_soon(
+                    forward_to_brokerd,
+                    brokerd_order_rx,
+                    brokerd_stream,
+                )
+
                 # start inbound (from attached client) order request processing
                 try:
                     _router.clients.add(ems_client_order_stream)
 
-                    await process_client_order_cmds(
+                    async with brokerd_order_tx:
+                        await process_client_order_cmds(
 
-                        ems_client_order_stream,
+                            ems_client_order_stream,
+                            brokerd_order_tx,
 
-                        # relay.brokerd_dialogue,
-                        brokerd_stream,
-
-                        symbol,
-                        feed,
-                        dark_book,
-                        _router,
-                    )
+                            symbol,
+                            feed,
+                            dark_book,
+                            _router,
+                        )
 
                 finally:
                     # remove client from "registry"
@@ -24,10 +24,23 @@ from typing import Optional, Union
 # import msgspec
 from pydantic import BaseModel
 
+
+class _Msg(BaseModel):
+    '''Base for all clearing msgs.
+
+    '''
+    def to_dict(self) -> dict:
+        '''Fast ``.dict()`` for our (flat) msg schemas: a shallow copy of
+        the field values without pydantic's generic (recursive) field
+        walk since none of these msgs nest other models.
+
+        '''
+        return self.__dict__.copy()
+
 # Client -> emsd
 
 
-class Cancel(BaseModel):
+class Cancel(_Msg):
     '''Cancel msg for removing a dark (ems triggered) or
     broker-submitted (live) trigger/order.
 
@@ -37,7 +50,7 @@ class Cancel(BaseModel):
     symbol: str
 
 
-class Order(BaseModel):
+class Order(_Msg):
 
     action: str  # {'buy', 'sell', 'alert'}
     # internal ``emdsd`` unique "order id"
@@ -62,7 +75,7 @@ class Order(BaseModel):
 # from the active clearing engine.
 
 
-class Status(BaseModel):
+class Status(_Msg):
 
     name: str = 'status'
     oid: str  # uuid4
@@ -105,7 +118,7 @@ class Status(BaseModel):
 # emsd -> brokerd
 # requests *sent* from ems to respective backend broker daemon
 
-class BrokerdCancel(BaseModel):
+class BrokerdCancel(_Msg):
 
     action: str = 'cancel'
     oid: str  # piker emsd order id
@@ -120,7 +133,7 @@ class BrokerdCancel(BaseModel):
     reqid: Optional[Union[int, str]] = None
 
 
-class BrokerdOrder(BaseModel):
+class BrokerdOrder(_Msg):
 
     action: str  # {buy, sell}
     oid: str
@@ -143,7 +156,7 @@ class BrokerdOrder(BaseModel):
 # requests *received* to ems from broker backend
 
 
-class BrokerdOrderAck(BaseModel):
+class BrokerdOrderAck(_Msg):
     '''Immediate reponse to a brokerd order request providing
     the broker specifci unique order id.
 
@@ -157,7 +170,7 @@ class BrokerdOrderAck(BaseModel):
     oid: str
 
 
-class BrokerdStatus(BaseModel):
+class BrokerdStatus(_Msg):
 
     name: str = 'status'
     reqid: Union[int, str]
@@ -187,7 +200,7 @@ class BrokerdStatus(BaseModel):
     }
 
 
-class BrokerdFill(BaseModel):
+class BrokerdFill(_Msg):
     '''A single message indicating a "fill-details" event from the broker
     if avaiable.
 
@@ -211,7 +224,7 @@ class BrokerdFill(BaseModel):
     broker_time: float
 
 
-class BrokerdError(BaseModel):
+class BrokerdError(_Msg):
     '''Optional error type that can be relayed to emsd for error handling.
 
     This is still a TODO thing since we're not sure how to employ it yet.
@@ -224,7 +237,7 @@ class BrokerdError(BaseModel):
     broker_details: dict = {}
 
 
-class BrokerdPosition(BaseModel):
+class BrokerdPosition(_Msg):
     '''Position update event from brokerd.
 
     '''
@@ -260,7 +260,7 @@ async def simulate_fills(
             for tick in iterticks(
                 quote,
                 # dark order price filter(s)
-                types=('ask', 'bid', 'trade', 'last')
+                types={'ask', 'bid', 'trade', 'last'}
             ):
                 # print(tick)
                 tick_price = tick.get('price')
@@ -18,14 +18,18 @@
 Stream format enforcement.
 """
 
-from typing import AsyncIterator, Optional, Tuple
+from typing import AbstractSet, AsyncIterator, Optional, FrozenSet
 
 import numpy as np
 
 
+# tick types which represent a (clearing) trade event
+_TRADE_TYPES: FrozenSet[str] = frozenset({'trade', 'utrade'})
+
+
 def iterticks(
     quote: dict,
-    types: Tuple[str] = ('trade', 'utrade'),
+    types: AbstractSet[str] = _TRADE_TYPES,
 ) -> AsyncIterator:
     """Iterate through ticks delivered per quote cycle.
     """
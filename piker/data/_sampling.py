@@ -25,6 +25,7 @@ import trio
 from trio_typing import TaskStatus
 
 from ._sharedmem import ShmArray
+from ._normalize import _TRADE_TYPES
 from ..log import get_logger
 
 
@@ -178,27 +179,38 @@ async def sample_and_broadcast(
 
             # start writing the shm buffer with appropriate
             # trade data
-            for tick in quote['ticks']:
 
-                ticktype = tick['type']
+            # (lazily) resolved last shm row, fixed for the whole
+            # quote since there's no checkpoint in the tick loop;
+            # updates are applied to a local staging copy and then
+            # published with a single (contiguous) row store such
+            # that readers never see a partially updated bar and the
+            # shared cache line is only written once per quote.
+            buf = row = None
+
+            for tick in quote['ticks']:
 
                 # write trade events to shm last OHLC sample
-                if ticktype in ('trade', 'utrade'):
+                if tick['type'] in _TRADE_TYPES:
 
                     last = tick['price']
 
-                    # update last entry
-                    # benchmarked in the 4-5 us range
-                    o, high, low, v = shm.array[-1][
-                        ['open', 'high', 'low', 'volume']
-                    ]
+                    # update last entry; per field writes to the
+                    # (struct scalar) staging row avoid building
+                    # a multi-field view + tuple per tick.
+                    if row is None:
+                        buf = shm.last()
+                        stage = buf.copy()
+                        row = stage[0]
+
+                    v = row['volume']
 
                     new_v = tick.get('size', 0)
 
                     if v == 0 and new_v:
                         # no trades for this bar yet so the open
                         # is also the close/last trade price
-                        o = last
+                        row['open'] = last
 
                     if sum_tick_vlm:
                         volume = v + new_v
@@ -207,21 +219,20 @@ async def sample_and_broadcast(
                         # it's own vlm
                         volume = quote['volume']
 
-                    shm.array[[
-                        'open',
-                        'high',
-                        'low',
-                        'close',
-                        'bar_wap',  # can be optionally provided
-                        'volume',
-                    ]][-1] = (
-                        o,
-                        max(high, last),
-                        min(low, last),
-                        last,
-                        quote.get('bar_wap', 0),
-                        volume,
-                    )
+                    if last > row['high']:
+                        row['high'] = last
+
+                    if last < row['low']:
+                        row['low'] = last
+
+                    row['close'] = last
+                    # can be optionally provided
+                    row['bar_wap'] = quote.get('bar_wap', 0)
+                    row['volume'] = volume
+
+            if buf is not None:
+                # publish the staged bar
+                buf[:] = stage
 
             # XXX: we need to be very cautious here that no
             # context-channel is left lingering which doesn't have
@@ -235,7 +246,12 @@ async def sample_and_broadcast(
 
                 try:
                     if tick_throttle:
-                        await stream.send(quote)
+                        # throttled subs are local mem chans so
+                        # skip the checkpoint unless it's full
+                        try:
+                            stream.send_nowait(quote)
+                        except trio.WouldBlock:
+                            await stream.send(quote)
 
                     else:
                         await stream.send({sym: quote})
@@ -271,39 +287,52 @@ async def uniform_rate_send(
         first_quote = await quote_stream.receive()
         start = time.time()
 
-        # append quotes since last iteration into the last quote's
-        # tick array/buffer.
+        # coalesce quotes since last iteration into a single quote
+        # holding the latest field values (last, bid/ask, volume etc.)
+        # with all ticks in arrival order appended to its tick array.
 
         # TODO: once we decide to get fancy really we should have
         # a shared mem tick buffer that is just continually filled and
         # the UI just ready from it at it's display rate.
         # we'll likely head toward this once we get this issue going:
         #
+        quote = first_quote
+        ticks = None
+
         while True:
             try:
                 next_quote = quote_stream.receive_nowait()
-                ticks = next_quote.get('ticks')
-
-                if ticks:
-                    first_quote['ticks'].extend(ticks)
-
             except trio.WouldBlock:
-                now = time.time()
-                rate = 1 / (now - last_send)
-                last_send = now
-
-                # print(f'{rate} Hz sending quotes\n{first_quote}')
-
-                # TODO: now if only we could sync this to the display
-                # rate timing exactly lul
-                try:
-                    await stream.send({first_quote['symbol']: first_quote})
-                    break
-                except trio.ClosedResourceError:
-                    # if the feed consumer goes down then drop
-                    # out of this rate limiter
-                    log.warning(f'{stream} closed')
-                    return
+                break
+
+            if ticks is None:
+                # NOTE: quote msgs are the same objects delivered to
+                # every other subscriber so we (lazily) copy instead
+                # of mutating them in place.
+                quote = dict(first_quote)
+                ticks = list(first_quote.get('ticks', ()))
+
+            quote.update(next_quote)
+            ticks.extend(next_quote.get('ticks', ()))
+
+        if ticks is not None:
+            quote['ticks'] = ticks
+
+        now = time.time()
+        rate = 1 / (now - last_send)
+        last_send = now
+
+        # print(f'{rate} Hz sending quotes\n{quote}')
+
+        # TODO: now if only we could sync this to the display
+        # rate timing exactly lul
+        try:
+            await stream.send({quote['symbol']: quote})
+        except trio.ClosedResourceError:
+            # if the feed consumer goes down then drop
+            # out of this rate limiter
+            log.warning(f'{stream} closed')
+            return
 
         end = time.time()
         diff = end - start
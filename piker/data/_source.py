@@ -81,6 +81,9 @@ class Symbol(BaseModel):
 
     Yah, i guess dats what it izz.
     """
+    # allow weak refs for the per-process registry in ``.feed``
+    __slots__ = ('__weakref__',)
+
     key: str
     tick_size: float = 0.01
     lot_tick_size: float = 0.01  # "volume" precision as min step value
@@ -62,6 +62,10 @@ class NoBsWs:
         self._stack = stack
         self._ws: 'WebSocketConnection' = None  # noqa
 
+        # bind (de)serialization routines once for the msg hot path
+        self._dumps = serializer.dumps
+        self._loads = serializer.loads
+
     async def _connect(
         self,
         tries: int = 1000,
@@ -107,7 +111,7 @@ class NoBsWs:
     ) -> None:
         while True:
             try:
-                return await self._ws.send_message(json.dumps(data))
+                return await self._ws.send_message(self._dumps(data))
             except self.recon_errors:
                 await self._connect()
 
@@ -116,7 +120,7 @@ class NoBsWs:
     ) -> Any:
         while True:
             try:
-                return json.loads(await self._ws.get_message())
+                return self._loads(await self._ws.get_message())
             except self.recon_errors:
                 await self._connect()
 
@@ -127,12 +131,15 @@ async def open_autorecon_ws(
 
     # TODO: proper type annot smh
     fixture: Callable,
+
+    # any module with ``json``-like ``loads()``/``dumps()`` funcs
+    serializer: ModuleType = json,
 ):
     """Apparently we can QoS for all sorts of reasons..so catch em.
 
     """
     async with AsyncExitStack() as stack:
-        ws = NoBsWs(url, stack, fixture=fixture)
+        ws = NoBsWs(url, stack, fixture=fixture, serializer=serializer)
         await ws._connect()
 
         try:
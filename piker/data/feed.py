@@ -20,12 +20,14 @@ Data feed apis and infra.
 This module is enabled for ``brokerd`` daemons.
 
 """
+from collections import defaultdict
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
 from functools import partial
 from types import ModuleType
+import weakref
 from typing import (
-    Any, Sequence,
+    Any, Sequence, Dict, NamedTuple,
     AsyncIterator, Optional,
     Awaitable, Callable,
 )
@@ -33,7 +35,6 @@ from typing import (
 import trio
 from trio_typing import TaskStatus
 import tractor
-from pydantic import BaseModel
 
 from ..brokers import get_brokermod
 from ..log import get_logger, get_console_log
@@ -60,8 +61,24 @@ from ._sampling import (
 
 log = get_logger(__name__)
 
+# size of the (per feed) mem chan buffering quotes from a backend's
+# ``stream_quotes()`` to the sampler; sized to absorb a full quote
+# burst such that backends only block (on ``send_chan.send()``)
+# when the sampler actually falls behind.
+_quote_chan_size: int = 2**10
 
-class _FeedsBus(BaseModel):
+
+class _FeedEntry(NamedTuple):
+    '''A persistent (cached) feed allocated by ``brokerd``.
+
+    '''
+    cs: trio.CancelScope
+    init_msg: dict
+    first_quote: dict
+
+
+@dataclass
+class _FeedsBus:
     """Data feeds broadcaster and persistence management.
 
     This is a brokerd side api used to manager persistent real-time
@@ -70,28 +87,20 @@ class _FeedsBus(BaseModel):
     """
     brokername: str
     nursery: trio.Nursery
-    feeds: dict[str, trio.CancelScope] = {}
+    feeds: dict[str, _FeedEntry] = field(default_factory=dict)
 
-    task_lock: trio.StrictFIFOLock = trio.StrictFIFOLock()
+    task_lock: trio.StrictFIFOLock = field(
+        default_factory=trio.StrictFIFOLock)
 
-    # XXX: so weird but, apparently without this being `._` private
-    # pydantic will complain about private `tractor.Context` instance
-    # vars (namely `._portal` and `._cancel_scope`) at import time.
-    # Reported this bug:
-    # https://github.com/samuelcolvin/pydantic/issues/2816
-    _subscribers: dict[
+    _subscribers: defaultdict[
         str,
         list[tuple[tractor.MsgStream, Optional[float]]]
-    ] = {}
-
-    class Config:
-        arbitrary_types_allowed = True
-        underscore_attrs_are_private = False
+    ] = field(default_factory=partial(defaultdict, list))
 
     async def cancel_all(self) -> None:
-        for sym, (cs, msg, quote) in self.feeds.items():
+        for sym, entry in self.feeds.items():
             log.debug(f'Cancelling cached feed for {self.brokername}:{sym}')
-            cs.cancel()
+            entry.cs.cancel()
 
 
 _bus: _FeedsBus = None
@@ -184,21 +193,37 @@ async def allocate_persistent_feed(
     # if not opened:
     #     raise RuntimeError("Persistent shm for sym was already open?!")
 
-    send, quote_stream = trio.open_memory_channel(10)
+    send, quote_stream = trio.open_memory_channel(_quote_chan_size)
     feed_is_live = trio.Event()
 
-    # establish broker backend quote stream
-    # ``stream_quotes()`` is a required backend func
-    init_msg, first_quote = await bus.nursery.start(
-        partial(
-            mod.stream_quotes,
-            send_chan=send,
-            feed_is_live=feed_is_live,
-            symbols=[symbol],
-            shm=shm,
-            loglevel=loglevel,
+    # establish the broker backend quote stream and (if we're the
+    # shm writer) history backfill concurrently since they're
+    # independent broker round trips.
+    started: Dict[str, Any] = {}
+
+    async def start_quotes() -> None:
+        # ``stream_quotes()`` is a required backend func
+        started['quotes'] = await bus.nursery.start(
+            partial(
+                mod.stream_quotes,
+                send_chan=send,
+                feed_is_live=feed_is_live,
+                symbols=[symbol],
+                shm=shm,
+                loglevel=loglevel,
+            )
         )
-    )
+
+    async with trio.open_nursery() as n:
+        n.start_soon(start_quotes)
+
+        if opened:
+            # start history backfill task ``backfill_bars()`` is
+            # a required backend func this must block until shm is
+            # filled with first set of ohlc bars
+            n.start_soon(bus.nursery.start, mod.backfill_bars, symbol, shm)
+
+    init_msg, first_quote = started['quotes']
 
     init_msg[symbol]['shm_token'] = shm.token
     cs = bus.nursery.cancel_scope
@@ -209,16 +234,18 @@ async def allocate_persistent_feed(
 
     # XXX: the ``symbol`` here is put into our native piker format (i.e.
     # lower case).
-    bus.feeds[symbol.lower()] = (cs, init_msg, first_quote)
-
-    if opened:
-        # start history backfill task ``backfill_bars()`` is
-        # a required backend func this must block until shm is
-        # filled with first set of ohlc bars
-        await bus.nursery.start(mod.backfill_bars, symbol, shm)
+    bus.feeds[symbol.lower()] = _FeedEntry(cs, init_msg, first_quote)
 
+    # NOTE: read the (strided) time column view once and only scan
+    # a small tail window for the prior distinct sample stamp.
     times = shm.array['time']
-    delay_s = times[-1] - times[times != times[-1]][-1]
+    last = times[-1]
+    tail = times[-16:]
+    prior = tail[tail != last]
+    if not prior.size:
+        prior = times[times != last]
+
+    delay_s = last - prior[-1]
 
     # pass OHLC sample rate in seconds (be sure to use python int type)
     init_msg[symbol]['sample_rate'] = int(delay_s)
@@ -265,9 +292,13 @@ async def attach_feed_bus(
 
     bus = get_feed_bus(brokername)
 
-    entry = bus.feeds.get(symbol)
+    # NOTE: the bus tables are keyed by our native piker (lower case)
+    # symbol format, see ``allocate_persistent_feed()``.
+    sym_lc = symbol.lower()
+
+    entry = bus.feeds.get(sym_lc)
 
-    bus._subscribers.setdefault(symbol, [])
+    subs = bus._subscribers[sym_lc]
 
     # if no cached feed for this symbol has been created for this
     # brokerd yet, start persistent stream and shm writer task in
@@ -289,11 +320,12 @@ async def attach_feed_bus(
                     loglevel=loglevel,
                 )
             )
-            assert isinstance(bus.feeds[symbol], tuple)
+            assert isinstance(bus.feeds[sym_lc], _FeedEntry)
 
     # XXX: ``first_quote`` may be outdated here if this is secondary
     # subscriber
-    cs, init_msg, first_quote = bus.feeds[symbol]
+    entry = bus.feeds[sym_lc]
+    init_msg, first_quote = entry.init_msg, entry.first_quote
 
     # send this even to subscribers to existing feed?
     # deliver initial info message a first quote asap
@@ -322,7 +354,7 @@ async def attach_feed_bus(
         else:
             sub = (stream, tick_throttle)
 
-        bus._subscribers[symbol].append(sub)
+        subs.append(sub)
 
         try:
             await trio.sleep_forever()
@@ -332,7 +364,7 @@ async def attach_feed_bus(
                 f'Stopping {symbol}.{brokername} feed for {ctx.chan.uid}')
             if tick_throttle:
                 n.cancel_scope.cancel()
-            bus._subscribers[symbol].remove(sub)
+            subs.remove(sub)
 
 
 @dataclass
@@ -426,6 +458,53 @@ async def install_brokerd_search(
                 yield
 
 
+# process-local registry of symbol info types per (broker, symbol)
+# built from feed init msgs; weak such that an entry only lives as long
+# as some (open) feed still references it.
+_symbols: weakref.WeakValueDictionary[
+    tuple[str, str], Symbol
+] = weakref.WeakValueDictionary()
+
+# process-local registry of (read-only) shm attachments, and the
+# number of open feeds using each, keyed by shm name so that multiple
+# feeds (charts, fsps, watchlists) for the same broker-symbol share
+# a single mapping.
+_attached_shms: dict[str, ShmArray] = {}
+_shm_users: dict[str, int] = {}
+
+
+@asynccontextmanager
+async def _open_shared_shm(token: dict) -> AsyncIterator[ShmArray]:
+    '''
+    Attach (read-only) to the shm array for ``token`` reusing any
+    attachment still in use by another feed in this process.
+
+    The entry is dropped once its last feed closes since shm names are
+    deterministic per broker-symbol; a later open must re-attach in
+    case ``brokerd`` has since (re)created the segment.
+
+    '''
+    key = token['shm_name']
+    shm = _attached_shms.get(key)
+    if shm is None:
+        # NOTE: the attachment itself is closed on actor teardown by
+        # ``attach_shm_array()``.
+        shm = _attached_shms[key] = attach_shm_array(
+            token=token,
+            readonly=True,
+        )
+        _shm_users[key] = 0
+
+    _shm_users[key] += 1
+    try:
+        yield shm
+    finally:
+        _shm_users[key] -= 1
+        if not _shm_users[key]:
+            del _shm_users[key]
+            del _attached_shms[key]
+
+
 @asynccontextmanager
 async def open_feed(
 
@@ -481,13 +560,10 @@ async def open_feed(
         ) as (ctx, (init_msg, first_quote)),
 
         ctx.open_stream() as stream,
-    ):
 
         # we can only read from shm
-        shm = attach_shm_array(
-            token=init_msg[sym]['shm_token'],
-            readonly=True,
-        )
+        _open_shared_shm(init_msg[sym]['shm_token']) as shm,
+    ):
 
         feed = Feed(
             name=brokername,
@@ -504,24 +580,28 @@ async def open_feed(
             si = data['symbol_info']
             ohlc_sample_rates.append(data['sample_rate'])
 
-            symbol = Symbol(
-                key=sym,
-                type_key=si.get('asset_type', 'forex'),
-                tick_size=si.get('price_tick_size', 0.01),
-                lot_tick_size=si.get('lot_tick_size', 0.0),
-            )
-            symbol.broker_info[brokername] = si
+            # the symbol info is normally the same (cached) init msg
+            # from the brokerd feed bus for every open so reuse any
+            # live instance built for this broker-symbol in this
+            # process unless brokerd has since sent different info.
+            symbol = _symbols.get((brokername, sym))
+            if symbol is None or symbol.broker_info.get(brokername) != si:
+                # skip pydantic validation; the only coercion it
+                # would do is to floats for the tick sizes.
+                symbol = _symbols[(brokername, sym)] = Symbol.construct(
+                    key=sym,
+                    type_key=si.get('asset_type', 'forex'),
+                    tick_size=float(si.get('price_tick_size', 0.01)),
+                    lot_tick_size=float(si.get('lot_tick_size', 0.0)),
+                )
+                symbol.broker_info[brokername] = si
 
             feed.symbols[sym] = symbol
 
-            # cast shm dtype to list... can't member why we need this
-            shm_token = data['shm_token']
-
-            # XXX: msgspec won't relay through the tuples XD
-            shm_token['dtype_descr'] = list(
-                map(tuple, shm_token['dtype_descr']))
-
-            assert shm_token == shm.token  # sanity
+            # NOTE: no need to re-check ``data['shm_token']`` against
+            # ``shm.token`` here since ``shm`` was attached from that
+            # very token (and ``_Token`` normalizes the dtype descr
+            # which msgpack turns into lists of lists in transit).
 
         feed._max_sample_rate = max(ohlc_sample_rates)
 
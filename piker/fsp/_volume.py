@@ -76,7 +76,7 @@ async def _tina_vwap(
 
     async for quote in source:
 
-        for tick in iterticks(quote, types=['trade']):
+        for tick in iterticks(quote, types={'trade'}):
 
             # c, h, l, v = ohlcv.array[-1][
             #     ['closes', 'high', 'low', 'volume']
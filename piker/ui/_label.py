@@ -18,11 +18,11 @@
 Non-shitty labels that don't re-invent the wheel.
 
 """
-from inspect import isfunction
+from types import FunctionType
 from typing import Callable
 
 import pyqtgraph as pg
-from PyQt5 import QtGui, QtWidgets
+from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import QPointF, QRectF
 
 from ._style import (
@@ -31,6 +31,29 @@ from ._style import (
 )
 
 
+# DPI configured fonts per (font size, screen name); Qt fonts are
+# value types (copied on ``.setFont()``) so can be shared by all labels.
+_fonts: dict[tuple[str, str], QtGui.QFont] = {}
+
+
+def _get_dpi_font(font_size: str) -> QtGui.QFont:
+    """Return a (cached) font configured to the current screen's DPI.
+
+    """
+    from ._window import main_window
+
+    screen = main_window().current_screen()
+    key = (font_size, screen.name())
+
+    font = _fonts.get(key)
+    if font is None:
+        dpi_font = DpiAwareFont(font_size=font_size)
+        dpi_font.configure_to_dpi(screen)
+        font = _fonts[key] = dpi_font.font
+
+    return font
+
+
 def vbr_left(label) -> Callable[..., float]:
     """Return a closure which gives the scene x-coordinate for the
     leftmost point of the containing view box.
@@ -56,6 +79,10 @@ def right_axis(
     """
     ryaxis = chart.getAxis('right')
 
+    # NOTE: these closures are called on every view range change so
+    # the (bound) axis position getter is resolved only once here.
+    ryaxis_pos = ryaxis.pos
+
     if side == 'left':
 
         if avoid_book:
@@ -67,12 +94,12 @@ def right_axis(
                 # sum of all distances "from" the y-axis
                 right_offset = l1_len + label.w + offset
 
-                return ryaxis.pos().x() - right_offset
+                return ryaxis_pos().x() - right_offset
 
         else:
             def right_axis_offset_by_w() -> float:
 
-                return ryaxis.pos().x() - (label.w + offset)
+                return ryaxis_pos().x() - (label.w + offset)
 
         return right_axis_offset_by_w
 
@@ -82,7 +109,7 @@ def right_axis(
 
         def on_axis() -> float:
 
-            return ryaxis.pos().x()  # + axis_offset - 2
+            return ryaxis_pos().x()  # + axis_offset - 2
 
         return on_axis
 
@@ -122,7 +149,10 @@ class Label:
 
         vb = self.vb = view
         self._fmt_str = fmt_str
-        self._view_xy = QPointF(0, 0)
+
+        # fields last rendered to text, see ``.format()``
+        self._last_fields: dict = None
+        self._view_y: float = 0
 
         self._x_offset = x_offset
 
@@ -130,15 +160,21 @@ class Label:
         vb.scene().addItem(txt)
 
         # configure font size based on DPI
-        dpi_font = DpiAwareFont(
-            font_size=font_size,
-        )
-        dpi_font.configure_to_dpi()
-        txt.setFont(dpi_font.font)
+        txt.setFont(_get_dpi_font(font_size))
 
         txt.setOpacity(opacity)
 
-        # register viewbox callbacks
+        # cached text geometry, only changes when the text (or font)
+        # does; see ``.format()``.
+        self._br: QRectF = txt.boundingRect()
+
+        # register viewbox callbacks; repositions are deferred through
+        # a (stoppable) zero-delay timer, see ``.on_sigrange_change()``.
+        self._deleted: bool = False
+        timer = self._reposition_timer = QtCore.QTimer()
+        timer.setSingleShot(True)
+        timer.setInterval(0)
+        timer.timeout.connect(self._reposition)
         vb.sigRangeChanged.connect(self.on_sigrange_change)
 
         self._hcolor: str = ''
@@ -166,15 +202,27 @@ class Label:
         self._hcolor = color
 
     def on_sigrange_change(self, vr, r) -> None:
-        self.set_view_y(self._view_xy.y())
+        # coalesce all range changes emitted in the current event
+        # loop iteration into a single (deferred) reposition.
+        timer = self._reposition_timer
+        if not timer.isActive():
+            timer.start()
+
+    def _reposition(self) -> None:
+        # the (already queued) timeout may still fire after ``.delete()``
+        # removed our item from the scene.
+        if self._deleted:
+            return
+
+        self.set_view_y(self._view_y)
 
     @property
     def w(self) -> float:
-        return self.txt.boundingRect().width()
+        return self._br.width()
 
     @property
     def h(self) -> float:
-        return self.txt.boundingRect().height()
+        return self._br.height()
 
     def vbr(self) -> QRectF:
         return self.vb.boundingRect()
@@ -193,22 +241,18 @@ class Label:
 
         scene_x = self._anchor_func() or self.txt.pos().x()
 
-        # get new (inside the) view coordinates / position
-        self._view_xy = QPointF(
-            self.vb.mapToView(QPointF(scene_x, scene_x)).x(),
-            y,
-        )
-
-        # map back to the outer UI-land "scene" coordinates
-        s_xy = self.vb.mapFromView(self._view_xy)
+        # the x anchor is already in scene coords so only map the new
+        # (inside the) view y-coordinate out to UI-land "scene" coords;
+        # the view transform is scale + translate only so y maps
+        # independently of x.
+        self._view_y = y
+        scene_y = self.vb.mapFromView(QPointF(0, y)).y()
 
         if self.orient_v == 'top':
-            s_xy = QPointF(s_xy.x(), s_xy.y() - self.h)
+            scene_y -= self.h
 
         # move label in scene coords to desired position
-        self.txt.setPos(s_xy)
-
-        assert s_xy == self.txt.pos()
+        self.txt.setPos(scene_x, scene_y)
 
     def orient_on(self, h: str, v: str) -> None:
         pass
@@ -220,16 +264,28 @@ class Label:
     @fmt_str.setter
     def fmt_str(self, fmt_str: str) -> None:
         self._fmt_str = fmt_str
+        self._last_fields = None
 
     def format(self, **fields: dict) -> str:
 
+        # skip re-rendering (and the Qt text re-layout triggered by
+        # setting new text) if nothing changed since the last call;
+        # any "calc" field (func) is only a function of the other
+        # fields so comparing by identity is sufficient.
+        if fields == self._last_fields:
+            return
+
+        self._last_fields = fields
+
         out = {}
 
         # this is hacky support for single depth
         # calcs of field data from field data
         # ex. to calculate a $value = price * size
         for k, v in fields.items():
-            if isfunction(v):
+            # NOTE: same check as ``inspect.isfunction()`` minus the
+            # extra python call per field.
+            if isinstance(v, FunctionType):
                 out[k] = v(fields)
             else:
                 out[k] = v
@@ -240,6 +296,7 @@ class Label:
         text = text.replace(',', ' ')
 
         self.txt.setPlainText(text)
+        self._br = self.txt.boundingRect()
 
     def render(self) -> None:
         self.format(**self.fields)
@@ -251,4 +308,7 @@ class Label:
         self.txt.hide()
 
     def delete(self) -> None:
+        self._deleted = True
+        self._reposition_timer.stop()
+        self.vb.sigRangeChanged.disconnect(self.on_sigrange_change)
         self.vb.scene().removeItem(self.txt)
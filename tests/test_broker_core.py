@@ -0,0 +1,457 @@
+"""
+Broker core api request coalescing and caching tests.
+"""
+from collections import defaultdict, OrderedDict
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+import trio
+from trio.testing import trio_test, wait_all_tasks_blocked
+
+from piker import _daemon
+from piker.brokers import core
+
+
+brokermod = SimpleNamespace(name='fake')
+
+
+class FakeClient:
+    """A broker client which records the requests made to it.
+
+    Requests can be held until ``.release`` is set (to keep them
+    in-flight) and made to raise ``.error``.
+    """
+    def __init__(self):
+        self.calls = []
+        self.block = False
+        self.release = trio.Event()
+        self.error = None
+        self.inflight = self.max_inflight = 0
+
+    async def _request(self, name, *args):
+        self.calls.append((name,) + args)
+        if self.block:
+            await self.release.wait()
+        if self.error:
+            raise self.error
+
+    async def quote(self, tickers):
+        await self._request('quote', tuple(tickers))
+        return [{'key': ticker, 'symbol': ticker} for ticker in tickers]
+
+    async def bars(self, symbol, **kwargs):
+        await self._request('bars', symbol)
+        return {'symbol': symbol, 'bars': []}
+
+    async def get_all_contracts(self, symbols):
+        await self._request('contracts', tuple(symbols))
+        return {symbol: {} for symbol in symbols}
+
+    async def symbol_info(self, symbols, **kwargs):
+        self.inflight += 1
+        self.max_inflight = max(self.inflight, self.max_inflight)
+        try:
+            await self._request('symbol_info', symbols)
+            await trio.sleep(0)
+        finally:
+            self.inflight -= 1
+
+        if isinstance(symbols, list):
+            return {symbol: {'symbol': symbol} for symbol in symbols}
+        return {'symbol': symbols}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeClient()
+
+    @asynccontextmanager
+    async def open_cached_client(brokername):
+        yield client
+
+    monkeypatch.setattr(core, 'open_cached_client', open_cached_client)
+
+    # fresh (process global) caches for each test
+    monkeypatch.setattr(core._QuoteCoalescer, '_by_broker', {})
+    monkeypatch.setattr(core, '_last_quotes', {})
+    monkeypatch.setattr(core, '_bars_inflight', {})
+    monkeypatch.setattr(core, '_contracts_cache', {})
+    monkeypatch.setattr(core, '_contracts_locks', defaultdict(trio.Lock))
+
+    return client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A manually advanced ``time.monotonic()`` for cache expiry.
+    """
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(
+        core, 'time', SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    """Replace brokerd searching with one which returns a single match
+    per broker and records each searched pattern.
+    """
+    searches = []
+
+    @asynccontextmanager
+    async def stream_symbol_search(brokermods, pattern):
+        searches.append(pattern)
+        send, recv = trio.open_memory_channel(len(brokermods))
+        async with send:
+            for mod in brokermods:
+                send.send_nowait(core.SearchResult(mod.name, {pattern: {}}))
+        yield recv
+
+    monkeypatch.setattr(core, 'stream_symbol_search', stream_symbol_search)
+    monkeypatch.setattr(core, '_search_cache', OrderedDict())
+    return searches
+
+
+class FakePortal:
+    """A ``brokerd`` portal which streams back one search chunk.
+    """
+    def __init__(self):
+        self.channel = SimpleNamespace(connected=lambda: True)
+
+    @asynccontextmanager
+    async def open_context(self, func, name, pattern):
+        async def stream():
+            yield {pattern: {}}
+
+        @asynccontextmanager
+        async def open_stream():
+            yield stream()
+
+        yield SimpleNamespace(open_stream=open_stream), None
+
+
+@pytest.fixture
+def spawns(monkeypatch):
+    """Replace ``brokerd`` spawning with one which records the task
+    entering and exiting each (fake) portal's block.
+    """
+    spawns = []
+
+    @asynccontextmanager
+    async def maybe_spawn_brokerd(brokername):
+        spawn = SimpleNamespace(
+            entered=trio.lowlevel.current_task(),
+            exited=None,
+        )
+        spawns.append(spawn)
+        try:
+            yield FakePortal()
+        finally:
+            spawn.exited = trio.lowlevel.current_task()
+
+    monkeypatch.setattr(_daemon, 'maybe_spawn_brokerd', maybe_spawn_brokerd)
+    monkeypatch.setattr(core, '_portals', {})
+    monkeypatch.setattr(core, '_search_cache', OrderedDict())
+    return spawns
+
+
+@trio_test
+async def test_concurrent_quotes_coalesced(client):
+    """Concurrent quote requests are made as a single broker request
+    and each caller only gets back the quotes it asked for.
+    """
+    results = {}
+
+    async def get_quotes(tickers):
+        results[tickers] = await core.stocks_quote(brokermod, tickers)
+
+    async with trio.open_nursery() as n:
+        n.start_soon(get_quotes, ('AAPL', 'TSLA'))
+        n.start_soon(get_quotes, ('SPY',))
+
+    assert len(client.calls) == 1
+    assert set(client.calls[0][1]) == {'AAPL', 'TSLA', 'SPY'}
+
+    for tickers, quotes in results.items():
+        assert {quote['key'] for quote in quotes} == set(tickers)
+
+
+@trio_test
+async def test_concurrent_bars_share_request(client):
+    """Identical concurrent ``bars()`` calls share one in-flight broker
+    request and its result.
+    """
+    client.block = True
+    results = []
+
+    async def get_bars():
+        results.append(await core.bars(brokermod, 'AAPL', count=10))
+
+    async with trio.open_nursery() as n:
+        for _ in range(3):
+            n.start_soon(get_bars)
+
+        await wait_all_tasks_blocked()
+        client.release.set()
+
+    assert client.calls == [('bars', 'AAPL')]
+    assert len(results) == 3
+    assert all(result is results[0] for result in results)
+    assert not core._bars_inflight
+
+
+@trio_test
+async def test_bars_error_reaches_every_waiter(client):
+    """A failed in-flight ``bars()`` request errors every caller waiting
+    on it and isn't left registered.
+    """
+    client.block = True
+    client.error = ValueError('broker down')
+    errors = []
+
+    async def get_bars():
+        with pytest.raises(ValueError) as err:
+            await core.bars(brokermod, 'AAPL', count=10)
+        errors.append(err.value)
+
+    async with trio.open_nursery() as n:
+        for _ in range(3):
+            n.start_soon(get_bars)
+
+        await wait_all_tasks_blocked()
+        client.release.set()
+
+    assert len(errors) == 3
+    assert not core._bars_inflight
+
+
+@trio_test
+async def test_quote_error_reaches_every_waiter(client):
+    """A failed coalesced quote request errors every caller in the batch.
+    """
+    client.error = ValueError('broker down')
+    errors = []
+
+    async def get_quotes(tickers):
+        with pytest.raises(ValueError) as err:
+            await core.stocks_quote(brokermod, tickers)
+        errors.append(err.value)
+
+    async with trio.open_nursery() as n:
+        n.start_soon(get_quotes, ('AAPL',))
+        n.start_soon(get_quotes, ('SPY',))
+
+    assert len(errors) == 2
+    assert not core._last_quotes
+
+
+@trio_test
+async def test_contracts_cached_until_ttl(client, clock):
+    """Contract lookups are served from cache until ``_contracts_ttl``
+    expires.
+    """
+    first = await core.contracts(brokermod, 'SPY')
+
+    clock.now += core._contracts_ttl - 1
+    assert await core.contracts(brokermod, 'SPY') is first
+    assert len(client.calls) == 1
+
+    clock.now += 2
+    assert await core.contracts(brokermod, 'SPY') is not first
+    assert len(client.calls) == 2
+
+
+@trio_test
+async def test_concurrent_contracts_share_request(client, clock):
+    """Concurrent lookups of the same symbol make one broker request.
+    """
+    client.block = True
+    results = []
+
+    async def get_contracts():
+        results.append(await core.contracts(brokermod, 'SPY'))
+
+    async with trio.open_nursery() as n:
+        for _ in range(3):
+            n.start_soon(get_contracts)
+
+        await wait_all_tasks_blocked()
+        client.release.set()
+
+    assert client.calls == [('contracts', ('SPY',))]
+    assert all(result is results[0] for result in results)
+
+
+@trio_test
+async def test_contracts_error_reaches_every_waiter(client, clock):
+    """A failed lookup errors every concurrent caller and isn't cached.
+    """
+    client.block = True
+    client.error = ValueError('broker down')
+    errors = []
+
+    async def get_contracts():
+        with pytest.raises(ValueError) as err:
+            await core.contracts(brokermod, 'SPY')
+        errors.append(err.value)
+
+    async with trio.open_nursery() as n:
+        for _ in range(3):
+            n.start_soon(get_contracts)
+
+        await wait_all_tasks_blocked()
+        client.release.set()
+
+    assert len(errors) == 3
+    assert not core._contracts_cache
+
+
+@trio_test
+async def test_symbol_infos_batched(client):
+    """Clients advertising batch lookups get a single request.
+    """
+    client.symbol_info_batched = True
+    symbols = ['AAPL', 'TSLA', 'SPY']
+
+    infos = await core.symbol_infos(brokermod, symbols)
+
+    assert client.calls == [('symbol_info', symbols)]
+    assert list(infos) == symbols
+
+
+@trio_test
+async def test_symbol_infos_bounded_and_ordered(client, monkeypatch):
+    """Per symbol lookups run with bounded concurrency and results keep
+    the input symbol order.
+    """
+    monkeypatch.setattr(core, '_symbol_info_concurrency', 2)
+    symbols = [f'SYM{i}' for i in range(10)]
+
+    infos = await core.symbol_infos(brokermod, symbols)
+
+    assert len(client.calls) == len(symbols)
+    assert client.max_inflight == 2
+    assert list(infos) == symbols
+    assert infos['SYM3'] == {'symbol': 'SYM3'}
+
+
+@trio_test
+async def test_quotes_cached_until_ttl(client, clock):
+    """Repeat quotes are served from cache until ``_quote_ttl`` expires.
+    """
+    first, = await core.stocks_quote(brokermod, ['AAPL'])
+
+    clock.now += core._quote_ttl / 2
+    assert await core.stocks_quote(brokermod, ['AAPL']) == [first]
+    assert len(client.calls) == 1
+
+    clock.now += core._quote_ttl
+    quote, = await core.stocks_quote(brokermod, ['AAPL'])
+    assert quote is not first
+    assert len(client.calls) == 2
+
+
+@trio_test
+async def test_quotes_only_request_expired(client, clock):
+    """Only uncached or expired tickers are requested and the results
+    keep the input ticker order.
+    """
+    await core.stocks_quote(brokermod, ['AAPL'])
+    clock.now += core._quote_ttl / 2
+
+    quotes = await core.stocks_quote(brokermod, ['TSLA', 'AAPL'])
+
+    assert client.calls[-1] == ('quote', ('TSLA',))
+    assert [quote['key'] for quote in quotes] == ['TSLA', 'AAPL']
+
+
+@trio_test
+async def test_search_cache_evicts_lru(searches, clock):
+    """The search cache holds at most ``_search_cache_size`` entries and
+    evicts the least recently used one first.
+    """
+    assert core._search_cache_size == 256
+    for i in range(core._search_cache_size):
+        await core.symbol_search([brokermod], f'sym{i}')
+
+    assert len(core._search_cache) == 256
+
+    # a cache hit makes the oldest entry the most recently used
+    await core.symbol_search([brokermod], 'sym0')
+    assert len(searches) == 256
+
+    await core.symbol_search([brokermod], 'new')
+
+    patterns = [pattern for brokers, pattern in core._search_cache]
+    assert len(patterns) == 256
+    assert 'sym0' in patterns
+    assert 'sym1' not in patterns
+    assert patterns[-1] == 'new'
+
+
+@trio_test
+async def test_search_cached_until_ttl(searches, clock):
+    """Repeat searches are served from cache until ``_search_cache_ttl``
+    expires.
+    """
+    first = await core.symbol_search([brokermod], 'spy')
+    assert first == [core.SearchResult('fake', {'spy': {}})]
+
+    clock.now += core._search_cache_ttl - 1
+    assert await core.symbol_search([brokermod], 'spy') == first
+    assert searches == ['spy']
+
+    clock.now += 2
+    await core.symbol_search([brokermod], 'spy')
+    assert searches == ['spy', 'spy']
+
+
+@trio_test
+async def test_search_cache_not_mutable(searches):
+    """Mutating a returned result list doesn't change later (cached)
+    results.
+    """
+    first = await core.symbol_search([brokermod], 'spy')
+    first.clear()
+
+    assert await core.symbol_search([brokermod], 'spy') == [
+        core.SearchResult('fake', {'spy': {}})
+    ]
+    assert searches == ['spy']
+
+
+@trio_test
+async def test_short_search_pattern_skipped(searches):
+    assert await core.symbol_search([brokermod], 's') == []
+    assert not searches
+    assert not core._search_cache
+
+
+@trio_test
+async def test_search_portals_reused(spawns):
+    """Searches inside ``open_brokerd_portals()`` share one portal per
+    broker which is entered and exited by the same (holder) task.
+    """
+    async with core.open_brokerd_portals():
+        for pattern in ('spy', 'qqq'):
+            result, = await core.symbol_search([brokermod], pattern)
+            assert result.matches == {pattern: {}}
+
+        assert len(spawns) == 1
+        assert spawns[0].exited is None
+
+    spawn, = spawns
+    assert spawn.exited is spawn.entered
+    assert not core._portals
+
+
+@trio_test
+async def test_search_portal_per_call(spawns):
+    """Without ``open_brokerd_portals()`` each search gets its own portal.
+    """
+    for pattern in ('spy', 'qqq'):
+        await core.symbol_search([brokermod], pattern)
+
+    assert len(spawns) == 2
+    assert all(spawn.exited is spawn.entered for spawn in spawns)
@@ -0,0 +1,199 @@
+"""
+EMS dark order trigger and cancel tests.
+"""
+from types import SimpleNamespace
+
+import pytest
+from trio.testing import trio_test
+
+from piker.clearing import _ems
+
+
+class FakeStream:
+    """A msg stream which records sent msgs.
+    """
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, msg):
+        self.sent.append(msg)
+
+
+class FakeClientStream(FakeStream):
+    """An ems client msg stream delivering ``cmds``.
+    """
+    def __init__(self, *cmds):
+        super().__init__()
+        self.cmds = cmds
+
+    async def __aiter__(self):
+        for cmd in self.cmds:
+            yield cmd
+
+
+async def iter_quotes(*quotes):
+    for quote in quotes:
+        yield quote
+
+
+def mk_book(
+    action: str,
+    trigger_price: float,
+    known_last: float,
+) -> _ems._DarkBook:
+    book = _ems._DarkBook('fake')
+    _, direction = _ems.mk_check(trigger_price, known_last, action)
+    tickfilter = {
+        'buy': _ems._buy_ttypes,
+        'sell': _ems._sell_ttypes,
+        'alert': _ems._alert_ttypes,
+    }[action]
+
+    entry = _ems._DarkOrder(
+        trigger_price,
+        direction,
+        tickfilter,
+        {'action': action, 'size': 1.0},
+        0.5 if action == 'buy' else -0.5 if action == 'sell' else 0,
+        {'oid': 'oid0', 'resp': 'dark_triggered', 'time_ns': 0},
+    )
+    execs = book.orders.setdefault('xbtusd', {})
+    for ttype in tickfilter:
+        execs.setdefault(ttype, {})['oid0'] = entry
+
+    return book
+
+
+async def clear(book, *ticks):
+    brokerd, client = FakeStream(), FakeStream()
+    await _ems.clear_dark_triggers(
+        brokerd,
+        client,
+        iter_quotes(*({'xbtusd': {'ticks': [tick]}} for tick in ticks)),
+        broker='fake',
+        symbol='xbtusd',
+        book=book,
+    )
+    return brokerd.sent, client.sent
+
+
+@pytest.mark.parametrize(
+    'action, trigger_price, known_last, ttype',
+    [
+        ('buy', 110, 100, 'ask'),
+        ('sell', 90, 100, 'bid'),
+        ('alert', 110, 100, 'trade'),
+        ('alert', 90, 100, 'trade'),
+    ],
+)
+@trio_test
+async def test_nan_tick_never_triggers(
+    action, trigger_price, known_last, ttype,
+):
+    """A nan tick price must not match any dark order or alert.
+    """
+    book = mk_book(action, trigger_price, known_last)
+
+    brokerd_msgs, statuses = await clear(
+        book,
+        {'type': ttype, 'price': float('nan')},
+    )
+
+    assert not brokerd_msgs
+    assert not statuses
+    assert all(
+        'oid0' in bucket for bucket in book.orders['xbtusd'].values()
+    )
+
+
+@pytest.mark.parametrize(
+    'action, trigger_price, known_last, price, ttype',
+    [
+        ('buy', 110, 100, 110, 'ask'),
+        ('sell', 90, 100, 89, 'bid'),
+    ],
+)
+@trio_test
+async def test_dark_order_triggers(
+    action, trigger_price, known_last, price, ttype,
+):
+    """A tick crossing (or touching) the trigger price submits an order
+    and removes the entry from every tick type bucket.
+    """
+    book = mk_book(action, trigger_price, known_last)
+
+    # a non-crossing tick first
+    brokerd_msgs, statuses = await clear(
+        book,
+        {'type': ttype, 'price': known_last},
+        {'type': ttype, 'price': price},
+    )
+
+    msg, = brokerd_msgs
+    assert msg['oid'] == 'oid0'
+    assert msg['action'] == action
+    assert msg['price'] == price + (0.5 if action == 'buy' else -0.5)
+
+    status, = statuses
+    assert status['resp'] == 'dark_triggered'
+    assert status['trigger_price'] == price
+
+    assert not any(book.orders['xbtusd'].values())
+
+
+async def cancel(book, symbol):
+    client = FakeClientStream(
+        {'action': 'cancel', 'oid': 'oid0', 'symbol': symbol},
+    )
+    router = SimpleNamespace(dialogues={})
+    await _ems.process_client_order_cmds(
+        client,
+        FakeStream(),
+        symbol=symbol,
+        feed=None,
+        dark_book=book,
+        router=router,
+    )
+    return client.sent, router.dialogues
+
+
+@trio_test
+async def test_dark_cancel():
+    """Cancelling a dark order removes it from every tick type bucket
+    and tells the client.
+    """
+    book = mk_book('buy', 110, 100)
+
+    statuses, dialogues = await cancel(book, 'xbtusd')
+
+    status, = statuses
+    assert status['resp'] == 'dark_cancelled'
+    assert status['oid'] == 'oid0'
+    assert not dialogues
+    assert not any(book.orders['xbtusd'].values())
+
+
+@trio_test
+async def test_dark_cancel_unknown_oid():
+    """A cancel for an order id not in the book of a known symbol is
+    still acked as ``dark_cancelled``.
+    """
+    book = mk_book('buy', 110, 100)
+    for bucket in book.orders['xbtusd'].values():
+        bucket.clear()
+
+    statuses, dialogues = await cancel(book, 'xbtusd')
+
+    status, = statuses
+    assert status['resp'] == 'dark_cancelled'
+    assert not dialogues
+
+
+@trio_test
+async def test_dark_cancel_unknown_symbol():
+    """A cancel for a symbol without a dark book is only logged.
+    """
+    statuses, dialogues = await cancel(_ems._DarkBook('fake'), 'xbtusd')
+
+    assert not statuses
+    assert 'oid0' in dialogues